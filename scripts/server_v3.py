@@ -211,9 +211,16 @@ def create_page_index(
     '''Modify the MediaDir in place by adding image, video, and page info.'''
     add_img_info(mdir.all_images(), root, thumbs_path, verbose=verbose)
     add_vid_info(mdir.all_videos(), root, thumbs_path, max_clip_duration, verbose=verbose)
+    add_page_counts(mdir)
     add_page_info(mdir.all_dirs(), root)
     return mdir
 
+def add_page_counts(mdir: mediatools.MediaDir) -> None:
+    '''Store recursive video/image counts in each dir's meta using a single post-order pass.'''
+    for sdir in mdir.all_dirs_iter():
+        sdir.meta['num_vids'] = len(sdir.videos) + sum(sd.meta['num_vids'] for sd in sdir.subdirs.values())
+        sdir.meta['num_imgs'] = len(sdir.images) + sum(sd.meta['num_imgs'] for sd in sdir.subdirs.values())
+
 
 def add_page_info(
     mdirs: list[mediatools.MediaDir],
@@ -290,8 +297,8 @@ def get_page_info(mdir: mediatools.MediaDir, root: pathlib.Path) -> dict[str,typ
         'vids': [vf.meta['info'] for vf in sorted_vids if vf.meta['info'] is not None and not vf.meta['info']['is_clip']],
         'clips': [vf.meta['info'] for vf in sorted_vids if vf.meta['info'] is not None and vf.meta['info']['is_clip']],
         'images': [imf.meta['info'] for imf in sorted_imgs if imf.meta['info'] is not None],
-        'num_vids': len(all_subdir_videos),
-        'num_imgs': len(all_subdir_images),
+        'num_vids': mdir.meta['num_vids'],
+        'num_imgs': mdir.meta['num_imgs'],
         'num_subpages': len(mdir.subdirs),
     }
 
@@ -1,12 +1,9 @@
 import typing
 import hashlib
-import multiprocessing
-import tqdm
 from pathlib import Path
 import os
 
-T = typing.TypeVar('T')
-R = typing.TypeVar('R')
+from mediatools.util import get_mp_context, parallel_map, parallel_starmap
 
 
 
@@ -44,33 +41,3 @@ def get_hash_hex(file_path: Path, chunk_size: int = 1024, max_chunks: int|None =
                 break
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest()
-
-def parallel_map(
-    func: typing.Callable[[T], R], 
-    elements: list[T], 
-    num_processes: int = 1, 
-    use_tqdm: bool = False
-) -> list[R]:
-    '''Map function in parallel using multiprocessing.'''
-    if use_tqdm:
-        elements = tqdm.tqdm(elements, total=len(elements))
-    if num_processes == 1:
-        return list(map(func, elements))
-    else:
-        with multiprocessing.Pool(num_processes) as pool:
-            return list(pool.map(func, elements))
-        
-def parallel_starmap(
-    func: typing.Callable[..., R],
-    elements: list[tuple[typing.Any, ...]], 
-    num_processes: int = 1, 
-    use_tqdm: bool = False
-) -> list[R]:
-    '''Map function in parallel using multiprocessing.'''
-    if use_tqdm:
-        elements = tqdm.tqdm(elements, total=len(elements))
-    if num_processes == 1:
-        return [func(*e) for e in elements]
-    else:
-        with multiprocessing.Pool(num_processes) as pool:
-            return list(pool.starmap(func, elements))
\ No newline at end of file
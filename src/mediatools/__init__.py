@@ -6,6 +6,7 @@ from .video import ffmpeg
 from .images import *
 from .mediadir import (
     MediaDir, 
+    DiffResult,
     scan_directory,
     display_directory_tree,
     DirectoryNotFoundError,
@@ -24,15 +25,23 @@ from .file_stat_result import FileStatResult
 
 from .util import (
     multi_extension_glob, 
+    single_pass_multi_ext_rglob,
+    iter_multi_ext_entries,
     format_time, 
     format_memory, 
     parse_url, 
     fname_to_title, 
     fname_to_id,
+    titleize_bulk,
     parallel_map,
     parallel_starmap,
     get_hash_firstlast_hex,
     get_hash_hex,
+    hash_file,
+    hash_files,
+    hash_file_cached,
+    hash_files_cached,
+    FileTree,
 )
 
 from . import util
@@ -3,6 +3,9 @@ import jinja2
 import typing
 import pathlib
 import dataclasses
+import functools
+import os
+import stat
 from PIL import Image
 
 from .infobase import InfoBase
@@ -16,16 +19,25 @@ class ImgInfo(InfoBase):
     config: SiteConfig
 
     @classmethod
-    def from_fpath(cls, fpath: pathlib.Path, config: SiteConfig) -> ImgInfo:
-        if not fpath.is_file():
+    def from_fpath(cls, fpath: pathlib.Path, config: SiteConfig, stat_result: os.stat_result | None = None) -> ImgInfo:
+        '''Read image size. Pass stat_result (e.g. from DirEntry.stat) to avoid another stat call.'''
+        is_file = fpath.is_file() if stat_result is None else stat.S_ISREG(stat_result.st_mode)
+        if not is_file:
             raise ValueError(f'The provided image is not a file: {fpath}')
         
         im = Image.open(str(fpath))
         width, height = im.size
 
-        return cls(fpath, res=(width, height), config=config)
+        info = cls(fpath, res=(width, height), config=config)
+        if stat_result is not None:
+            info.stat_result = stat_result
+        return info
     
     def info_dict(self) -> typing.Dict[str, str]:
+        return self._info_dict.copy()
+
+    @functools.cached_property
+    def _info_dict(self) -> typing.Dict[str, str]:
         return {
             'path': parse_url(self.fpath.name),
             'title': fname_to_title(self.fpath.stem),
@@ -37,5 +49,8 @@ class ImgInfo(InfoBase):
     
     def path_rel(self) -> pathlib.Path:
         '''Thumb path relative to base path.'''
-        fp = self.fpath.relative_to(self.config.base_path)
-        return fp
+        return self._path_rel
+
+    @functools.cached_property
+    def _path_rel(self) -> pathlib.Path:
+        return self.fpath.relative_to(self.config.base_path)
@@ -3,6 +3,7 @@ import jinja2
 import typing
 import pathlib
 import dataclasses
+import functools
 import pprint
 import subprocess
 import os
@@ -22,8 +23,13 @@ class InfoBase:
         '''Path relative to the original base path.'''
         return self.fpath.relative_to(self.config.base_path)
     
+    @functools.cached_property
+    def stat_result(self) -> os.stat_result:
+        '''Stat of the file, read at most once. Scanning seeds it from the DirEntry.'''
+        return self.fpath.stat()
+
     def file_size(self) -> int:
-        return self.fpath.stat().st_size
+        return self.stat_result.st_size
 
 
 
@@ -3,6 +3,9 @@ import jinja2
 import typing
 import pathlib
 import dataclasses
+import functools
+import heapq
+import concurrent.futures
 import pprint
 import subprocess
 import os
@@ -52,29 +55,42 @@ class PageInfo:
     
     @classmethod
     def scan_vid_infos(cls, fpath: pathlib.Path, config: SiteConfig) -> list[VidInfo]:
-        img_infos = list()
-        for fp in cls.base_get_fpaths(fpath, extensions=config.vid_extensions):
+        '''Probe videos in fpath concurrently. Each probe is an ffprobe subprocess, so 
+            threads overlap them. Videos that cannot be probed are skipped.
+        '''
+        def probe(entry: os.DirEntry) -> VidInfo | None:
             try:
-                img_infos.append(VidInfo.from_fpath(fp, config))
+                return VidInfo.from_fpath(pathlib.Path(entry.path), config, stat_result=entry.stat())
             except ProbeError as e:
-                pass
-        return img_infos
+                return None
+
+        entries = cls.base_get_entries(fpath, extensions=config.vid_extensions)
+        if len(entries) <= 1:
+            vid_infos = [probe(e) for e in entries]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1)*2)) as executor:
+                vid_infos = list(executor.map(probe, entries))
+        return [vi for vi in vid_infos if vi is not None]
     
     @classmethod
     def scan_img_infos(cls, fpath: pathlib.Path, config: SiteConfig) -> list[ImgInfo]:
         img_infos = list()
-        for fp in cls.base_get_fpaths(fpath, extensions=config.img_extensions):
+        for entry in cls.base_get_entries(fpath, extensions=config.img_extensions):
             try:
-                img_infos.append(ImgInfo.from_fpath(fp, config))
+                img_infos.append(ImgInfo.from_fpath(pathlib.Path(entry.path), config, stat_result=entry.stat()))
             except (ValueError, PIL.UnidentifiedImageError) as e:
                 pass
         return img_infos
 
     @classmethod
     def scan_subpages(cls, fpath: pathlib.Path, config: SiteConfig, verbose: bool = False) -> list[PageInfo]:
+        # DirEntry.is_dir is answered from readdir's d_type (no stat except for symlinks)
+        with os.scandir(fpath) as it:
+            subdirs = [e.path for e in it if e.is_dir()]
+        subdirs.sort() # same parent, so this orders by name
         subpages = list()
-        for cp in sorted(fpath.iterdir()):
-            if cp.is_dir() and not cp.is_relative_to(config.thumb_base_path):
+        for cp in map(pathlib.Path, subdirs):
+            if not cp.is_relative_to(config.thumb_base_path):
                 try:
                     subpages.append(cls.from_fpath(fpath=cp, config=config, verbose=verbose))
                 except ValueError:
@@ -83,10 +99,22 @@ class PageInfo:
 
     @staticmethod
     def base_get_fpaths(fpath: pathlib.Path, extensions: tuple[str]|list[str]) -> typing.List[pathlib.Path]:
-        all_paths = list()
-        for ext in extensions:
-            all_paths += list(sorted(fpath.glob(f'*.{ext}')))
-        return all_paths
+        '''Paths in fpath with the given extensions, grouped by extension in the given 
+            order and sorted within each group. Reads the directory once instead of globbing 
+            once per extension.
+        '''
+        return [pathlib.Path(e.path) for e in PageInfo.base_get_entries(fpath, extensions)]
+
+    @staticmethod
+    def base_get_entries(fpath: pathlib.Path, extensions: tuple[str]|list[str]) -> typing.List[os.DirEntry]:
+        '''DirEntry version of base_get_fpaths, so callers can reuse the cached entry.stat().'''
+        by_ext: dict[str, list[os.DirEntry]] = {ext: [] for ext in extensions} # also drops duplicate extensions
+        with os.scandir(fpath) as it:
+            for entry in it:
+                stem, dot, ext = entry.name.rpartition('.')
+                if dot and (entries := by_ext.get(ext)) is not None:
+                    entries.append(entry)
+        return [e for entries in by_ext.values() for e in sorted(entries, key=lambda e: e.name)]
 
     ############################################ getting sorted and filtered infos ############################################
     def get_vid_info_dicts(self, 
@@ -124,19 +152,20 @@ class PageInfo:
         filter_cond: typing.Callable[[VidInfo|ImgInfo|PageInfo],bool] = lambda x: True,
         sort_key: typing.Optional[typing.Callable[[VidInfo|ImgInfo|PageInfo],float|str|int]] = None,
     ) -> list[dict]:
-        els = elements
         if filter_cond is not None:
-            els = [vi for vi in els if filter_cond(vi)]
+            els = [vi for vi in elements if filter_cond(vi)]
+        else:
+            els = list(elements) # copy so sorting never reorders the page itself
         if sort_key is not None:
-            els = list(sorted(els, key=sort_key))
+            els.sort(key=sort_key)
         return [e.info_dict() for e in els]
 
     ############################################ getting information ############################################
     def info_dict(self) -> typing.Dict[str, float]:
         '''Information about this page as a dictionary.'''
         return {
-            'path': f'/{str(self.page_path_rel())}', 
-            'path_rel': f'{str(self.page_path_rel())}', 
+            'path': f'/{self.page_path_rel_str}', 
+            'path_rel': self.page_path_rel_str, 
             'name': self.title, 
             'subfolder_thumb': parse_url('/'+str(self.get_best_thumb())),
             'num_vids': len(self.vid_infos),
@@ -153,6 +182,11 @@ class PageInfo:
         '''Get the relative page path for use in links.'''
         return self.folder_fpath_rel.joinpath(self.config.page_fname)
     
+    @functools.cached_property
+    def page_path_rel_str(self) -> str:
+        '''page_path_rel formatted once for templates; the tree is not modified after scanning.'''
+        return str(self.page_path_rel())
+    
     @property
     def title(self) -> str:
         return fname_to_title(self.folder_fpath.name)
@@ -167,15 +201,30 @@ class PageInfo:
     
     def total_vids(self) -> int:
         '''Recursively count videos in this and all subdirectories.'''
-        return len(self.vid_infos) + sum([sp.total_vids() for sp in self.subpages])
+        return self.aggregate_stats[0]
     
     def total_imgs(self) -> int:
         '''Recursively count videos in this and all subdirectories.'''
-        return len(self.img_infos) + sum([sp.total_imgs() for sp in self.subpages])
+        return self.aggregate_stats[1]
     
     def total_size(self) -> int:
         '''Recursively count size of all media files.'''
-        return self.data_size() + sum([sp.total_size() for sp in self.subpages])
+        return self.aggregate_stats[2]
+    
+    @functools.cached_property
+    def aggregate_stats(self) -> tuple[int, int, int]:
+        '''(videos, images, bytes) in this and all subdirectories, counted in one walk. 
+            Cached because the tree is not modified after scanning.
+        '''
+        vids, imgs, size = 0, 0, 0
+        stack = [self]
+        while stack:
+            page = stack.pop()
+            vids += len(page.vid_infos)
+            imgs += len(page.img_infos)
+            size += page.data_size()
+            stack.extend(page.subpages)
+        return vids, imgs, size
     
     def data_size(self) -> int:
         '''Size of all videos and images in this directory.'''
@@ -183,11 +232,35 @@ class PageInfo:
     
     def all_vid_infos(self) -> typing.List[VidInfo]:
         '''Get video infos of this directory and all subdirectories.'''
-        return self.vid_infos + [vi for sp in self.subpages for vi in sp.all_vid_infos()]
+        return list(self.iter_vid_infos())
 
     def all_img_infos(self) -> typing.List[ImgInfo]:
         '''Get image infos of this directory and all subdirectories.'''
-        return self.img_infos + [ii for sp in self.subpages for ii in sp.all_img_infos()]
+        return list(self.iter_img_infos())
+
+    def iter_vid_infos(self) -> typing.Iterator[VidInfo]:
+        '''Iterate over video infos of this directory and all subdirectories without building a list.'''
+        for page in self._iter_pages():
+            yield from page.vid_infos
+
+    def iter_img_infos(self) -> typing.Iterator[ImgInfo]:
+        '''Iterate over image infos of this directory and all subdirectories without building a list.'''
+        for page in self._iter_pages():
+            yield from page.img_infos
+
+    def _iter_pages(self) -> typing.Iterator[PageInfo]:
+        '''This page and all subpages, parents before children (explicit stack, no recursion).'''
+        stack = [self]
+        while stack:
+            page = stack.pop()
+            yield page
+            stack.extend(reversed(page.subpages))
+
+    def top_k_videos(self, k: int, sort_key: typing.Callable[[VidInfo],float|str|int]) -> typing.List[VidInfo]:
+        '''The k videos in this and all subdirectories with the smallest sort_key, in order. 
+            Uses a bounded heap instead of sorting every video.
+        '''
+        return heapq.nsmallest(k, self.iter_vid_infos(), key=sort_key)
 
     def make_thumbs(self, verbose: bool = False) -> None:
         vis = self.vid_infos
@@ -195,22 +268,19 @@ class PageInfo:
             print(f'making thumbns in {self.folder_fpath}')
             vis = tqdm.tqdm(vis, ncols=80)
         
+        thumb_index = VidInfo.build_thumb_index(self.config)
         for vi in vis:
             try:
-                vi.make_thumb()
+                vi.make_thumb(thumb_index)
             except FFMPEGError as e:
                 pass
         
     def get_best_thumb(self) -> pathlib.Path:
         '''Get best thumbnail from videos in all fubfolders.'''
-        vis = self.all_vid_infos()
-        if len(vis) == 0:
-            imgs = self.all_img_infos()
-            if len(imgs):
-                return imgs[0].path_rel()
-            else:
-                return None
-        mvi = min(vis, key=lambda sp: abs(sp.aspect() - self.config.ideal_aspect))
+        mvi = min(self.iter_vid_infos(), key=lambda sp: abs(sp.aspect() - self.config.ideal_aspect), default=None)
+        if mvi is None:
+            img = next(self.iter_img_infos(), None)
+            return img.path_rel() if img is not None else None
         return mvi.thumb_path_rel()
     
     ################################## DEPRICATED ##################################
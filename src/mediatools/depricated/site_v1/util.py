@@ -1,16 +1,28 @@
 import urllib
+import urllib.parse
+import functools
+import re
 
 
+_TITLE_TRANS = str.maketrans('_-', '  ')
+_WS_RE = re.compile(r'\s+') # same whitespace set as str.split()
+
+@functools.lru_cache(maxsize=4096)
 def fname_to_title(fname: str, max_char: int = 150) -> str:
-    replaced = fname.replace('_', ' ').replace('-', ' ')
-    return ' '.join(replaced.strip().split()).title()[:max_char]
+    return _WS_RE.sub(' ', fname.translate(_TITLE_TRANS).strip()).title()[:max_char]
 
+@functools.lru_cache(maxsize=4096)
 def fname_to_id(fname: str) -> str:
-    return '-'.join(fname.strip().split())
+    return _WS_RE.sub('-', fname.strip())
 
 def parse_url(urlstr: str) -> str:
     try:
-        return urllib.parse.quote(urlstr)
-    except TypeError as e:
+        return _quote_cached(urlstr)
+    except TypeError as e: # also raised by the cache for unhashable input
         return ''
 
+@functools.lru_cache(maxsize=8192)
+def _quote_cached(urlstr: str) -> str:
+    '''Media paths are quoted again for every render that links to them.'''
+    return urllib.parse.quote(urlstr)
+
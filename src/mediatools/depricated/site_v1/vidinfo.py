@@ -4,6 +4,7 @@ import jinja2
 import typing
 import pathlib
 import dataclasses
+import functools
 import pprint
 import subprocess
 import os
@@ -30,16 +31,21 @@ class VidInfo(InfoBase):
     config: SiteConfig
 
     @classmethod
-    def from_fpath(cls, vpath: pathlib.Path, config: SiteConfig) -> VidInfo:
-        '''Get video information by probing video file.'''
+    def from_fpath(cls, vpath: pathlib.Path, config: SiteConfig, stat_result: os.stat_result | None = None) -> VidInfo:
+        '''Get video information by probing video file. Pass stat_result (e.g. from 
+            DirEntry.stat) to avoid another stat call for the file size.
+        '''
         probe = VideoFile.from_path(vpath).probe()
         probe.video # will error if there is no video stream
 
-        return cls(
+        info = cls(
             vf = VideoFile(vpath),
             probe = probe, 
             config = config,
         )
+        if stat_result is not None:
+            info.stat_result = stat_result
+        return info
     
     @property
     def fpath(self) -> pathlib.Path:
@@ -51,13 +57,27 @@ class VidInfo(InfoBase):
         #    return self.probe.video.aspect_ratio
         #return self.probe.video.width / self.probe.video.height
         
-    def has_thumb(self) -> bool:
+    @staticmethod
+    def build_thumb_index(config: SiteConfig) -> set[str]:
+        '''Names of the files in the thumb directory, read with a single scandir.
+            Pass to has_thumb/make_thumb to avoid a stat per video.
+        '''
+        try:
+            with os.scandir(config.thumb_base_path) as it:
+                return {e.name for e in it}
+        except FileNotFoundError:
+            return set()
+
+    def has_thumb(self, thumb_index: set[str] | None = None) -> bool:
+        '''Check whether the thumbnail exists, using thumb_index (see build_thumb_index) if given.'''
+        if thumb_index is not None:
+            return self.thumb_path_abs().name in thumb_index
         return self.thumb_path_abs().is_file()
 
-    def make_thumb(self):
+    def make_thumb(self, thumb_index: set[str] | None = None):
         '''Actually make thumbnail.'''
         tfp = self.thumb_path_abs()
-        if not tfp.is_file(): # NOTE: delete this if trying to force write
+        if not self.has_thumb(thumb_index): # NOTE: delete this if trying to force write
             tfp.parent.mkdir(exist_ok=True, parents=True)
             return self.vf.ffmpeg.make_thumb(str(tfp))
             #return pydevin.make_thumb_ffmpeg(str(self.fpath), str(tfp))
@@ -69,6 +89,11 @@ class VidInfo(InfoBase):
 
     def thumb_path_abs(self) -> pathlib.Path:
         '''Absolute thumb path.'''
+        return self.thumb_path_abs_cached
+
+    @functools.cached_property
+    def thumb_path_abs_cached(self) -> pathlib.Path:
+        '''Absolute thumb path, computed once per instance.'''
         rel_path = self.get_rel_path().with_suffix(self.config.thumb_extension)
         #print(f'=============')
         #print(rel_path)
@@ -94,12 +119,13 @@ class VidInfo(InfoBase):
             return False
     
     def info_dict(self) -> typing.Dict[str, str|int|bool]:
+        size = self.file_size()
         return {
             'vid_web': self.vid_web,
             'vid_title': self.vid_title,
             'thumb_web': parse_url('/'+str(self.thumb_path_rel())),
-            'vid_size': self.file_size(),
-            'vid_size_str': format_memory(self.file_size()),
+            'vid_size': size,
+            'vid_size_str': format_memory(size),
             
             # from ffmpeg probe
             'is_clip': self.is_clip,
@@ -108,13 +134,17 @@ class VidInfo(InfoBase):
             'duration_str': format_time(self.probe.duration),
             'res_str': f'{self.probe.video.width}x{self.probe.video.height}',
             'aspect': self.probe.video.aspect_ratio,
-            'idx': fname_to_id(self.fpath.stem)
+            'idx': self.vid_idx,
         }
+
+    @functools.cached_property
+    def vid_idx(self) -> str:
+        return fname_to_id(self.fpath.stem)
     
-    @property
+    @functools.cached_property
     def vid_title(self) -> str:
         return fname_to_title(self.fpath.stem)
 
-    @property
+    @functools.cached_property
     def vid_web(self) -> str:
         return parse_url(self.fpath.name)
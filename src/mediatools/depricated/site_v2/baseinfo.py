@@ -1,12 +1,15 @@
 from __future__ import annotations
 import pathlib
+import os
 from .siteconfig import SiteConfig
 
 
 
 class BaseInfo:
+    __slots__ = ('_stat',) # prefetched during discovery or memoized on first use
     fpath: pathlib.Path
     config: SiteConfig
+    _stat: os.stat_result
 
     #@classmethod
     #def from_path(self, *args, **kwargs):
@@ -20,8 +23,16 @@ class BaseInfo:
         '''Path relative to the original base path.'''
         return self.config.abs_to_rel(self.fpath)#self.fpath.relative_to(self.config.base_path)
 
+    def file_stat(self) -> os.stat_result:
+        '''Stat result of the file, only read from disk if it was not prefetched.'''
+        try:
+            return self._stat
+        except AttributeError:
+            object.__setattr__(self, '_stat', self.fpath.stat())
+            return self._stat
+
     def file_size(self) -> int:
-        return self.fpath.stat().st_size
+        return self.file_stat().st_size
 
 
 
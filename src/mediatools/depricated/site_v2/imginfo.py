@@ -15,13 +15,13 @@ from PIL import Image
 from ..images import ImageFile
 from .baseinfo import BaseInfo
 from .siteconfig import SiteConfig
-from .util import fname_to_title, parse_url
-from ..util import multi_extension_glob
+from .util import fname_to_title, parse_url, thread_map
+from ..util import iter_multi_ext_entries
 
 Width = int
 Height = int
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ImgInfo(BaseInfo):
     imf: ImageFile
     config: SiteConfig
@@ -33,23 +33,39 @@ class ImgInfo(BaseInfo):
         cls, 
         path: pathlib.Path, 
         config: SiteConfig, 
+        max_workers: int | None = None,
     ) -> list[typing.Self]:
-        '''Scan directory for video files and return list of info objects.'''
-        return [cls.from_path(fp, config) for fp in multi_extension_glob(path.glob, config.img_extensions)]
+        '''Scan directory for image files and return list of info objects. Files are 
+            read concurrently in a thread pool since the work is I/O bound.
+        '''
+        entries = sorted(iter_multi_ext_entries(path, config.img_extensions, recursive=False), key=lambda e: e.name)
+        return thread_map(
+            lambda e: cls.from_path(pathlib.Path(e.path), config, stat_result=e.stat()), 
+            entries, 
+            max_workers=max_workers,
+        )
 
     @classmethod
-    def from_path(cls, path: pathlib.Path, config: SiteConfig) -> typing.Self:
-        '''Create ImgInfo object from file path.'''
-        path = pathlib.Path(path)
-        imf = ImageFile.from_path(path)
-        h,w,z = imf.read().shape
-        return cls(
+    def from_path(cls, path: pathlib.Path, config: SiteConfig, stat_result: os.stat_result | None = None) -> typing.Self:
+        '''Create ImgInfo object from file path. stat_result can be passed if already known.'''
+        path = path if isinstance(path, pathlib.Path) else pathlib.Path(path) # avoid re-parsing existing Paths
+        if stat_result is None:
+            stat_result = os.stat(path) # also serves as the existence check
+        imf = ImageFile.from_path(path, stat_result=stat_result)
+        w,h = imf.probe_size() # header only, pixels are never decoded
+        o = cls(
             imf = imf, 
             config = config,
             res=(w,h),
-            size = path.stat().st_size,
+            size = stat_result.st_size,
         )
+        o._stat = stat_result
+        return o
     
+    @property
+    def fpath(self) -> pathlib.Path:
+        return self.imf.path
+
     def info_dict(self) -> typing.Dict[str, str|int]:
         return {
             'path': parse_url(self.fpath.name),
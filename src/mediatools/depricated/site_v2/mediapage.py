@@ -2,17 +2,24 @@ from __future__ import annotations
 import typing
 import pathlib
 import dataclasses
+import os
+import functools
+import concurrent.futures
 
 #from .siteconfig import SiteConfig
 from .siteconfig import SiteConfig
 from .vidinfo import VidInfo
 from .imginfo import ImgInfo
+from .util import default_io_workers
 from ..util import format_memory, format_time, multi_extension_glob
  
 #from ..vtools import ProbeError, FFMPEGCommandError
 
 
-@dataclasses.dataclass(repr=False)
+# thread pool overhead is not worth it for directories with only a few subfolders
+_MIN_PARALLEL_SUBPAGES = 4
+
+@dataclasses.dataclass(repr=False, slots=True)
 class MediaPage:
     '''Stores information about a directory of media files (recursive data structure).
     Properties:
@@ -29,6 +36,12 @@ class MediaPage:
     clips: list[VidInfo]
     images: list[ImgInfo]
     subpages: list[typing.Self] | None
+    page_path_str: str = dataclasses.field(init=False, repr=False, compare=False)
+    _stats: tuple[int, int, int, int] | None = dataclasses.field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # the tree is not modified after scanning, so the page path is formatted once
+        self.page_path_str = os.path.join(self.local_path, self.config.page_fname)
 
     @classmethod
     def scan_directory(
@@ -39,8 +52,12 @@ class MediaPage:
         verbose: bool = False,
         read_media: bool = True,
         i: int = 0, 
+        parallel: bool = True,
     ) -> VidInfo:
-        '''Recursively scan a directory to collect information about the media files and subfolders.'''
+        '''Recursively scan a directory to collect information about the media files and subfolders.
+            If parallel, the first directory with more than a few subfolders scans them concurrently 
+            (one thread per subtree); everything below that level is scanned serially.
+        '''
         if verbose: print(path)
 
         if read_media:
@@ -70,17 +87,23 @@ class MediaPage:
 
         if verbose: print('\tscanning subpages')
         if recursive and (config.max_depth is None or i < config.max_depth):
-            subpages = list()
-            for p in path.iterdir():
-                if p.is_dir() and p != config.thumb_path:
-                    page = cls.scan_directory(
-                        path=p, 
-                        config=config, 
-                        verbose=verbose, 
-                        read_media=read_media, 
-                        i=i+1
-                    )
-                    subpages.append(page)
+            # DirEntry.is_dir is answered from readdir's d_type (no stat except for symlinks)
+            with os.scandir(path) as it:
+                subfolders = [pathlib.Path(e.path) for e in it if e.is_dir() and not config.is_thumb_dir(e)]
+            scan_child = functools.partial(
+                cls.scan_directory,
+                config=config, 
+                verbose=verbose, 
+                read_media=read_media, 
+                i=i+1,
+            )
+            if parallel and len(subfolders) > _MIN_PARALLEL_SUBPAGES:
+                # subtrees are independent and dominated by ffprobe/file I/O latency, so threads
+                # suffice; children run serially so pools are never nested
+                with concurrent.futures.ThreadPoolExecutor(max_workers=default_io_workers()) as executor:
+                    subpages = list(executor.map(lambda p: scan_child(path=p, parallel=False), subfolders))
+            else:
+                subpages = [scan_child(path=p, parallel=parallel) for p in subfolders]
 
             if config.subpage_sort_key:
                 subpages.sort(key=config.subpage_sort_key)
@@ -107,30 +130,68 @@ class MediaPage:
                     verbose=verbose,
                 )
 
-        html_str = self.config.template.render(
-            vid_thumbs = vid_thumbs,
-            vids = vids, 
-            clips = clips,
-            imgs = imgs,
-            child_paths = subpages, 
-            video_width = self.config.video_width, 
-            clip_width = self.config.clip_width,
-            name = self.local_path.name,
-        )
+        html_str = self.config.template.render(**self.render_context())
 
         # write the template
         pp = self.page_path()
-        if verbose: print(f'saving {pp} with {len(self.images)} images, {len(self.videos)} vids, and {len(self.subpages)} subfolders')
+        if verbose: print(f'saving {pp} with {len(self.images)} images, {len(self.videos)} vids, and {len(self.subpages or [])} subfolders')
         with pp.open('w') as f:
             f.write(html_str)
     
+    def render_context(self) -> dict[str, typing.Any]:
+        '''Template variables for this page. Media info is materialized once into plain 
+            dicts and lists because dict lookups are cheaper than attribute access in Jinja.
+        '''
+        vids = [vi.info_dict() for vi in self.videos]
+        return {
+            **self.config.template_args,
+            'vids': vids,
+            'vid_thumbs': [vd['thumb'] for vd in vids],
+            'clips': [vi.info_dict() for vi in self.clips],
+            'imgs': [ii.info_dict() for ii in self.images],
+            'child_paths': [f'{sp.local_path.name}/{self.config.page_fname}' for sp in self.subpages or []],
+            'name': self.local_path.name,
+        }
+
+    def page_path(self) -> pathlib.Path:
+        '''Path of the html file for this page.'''
+        return pathlib.Path(self.page_path_str)
+
     ############################################ extract info ############################################
     def page_count(self) -> int:
-        '''Count all media files in this page and subpages.'''
-        if self.subpages is not None:
-            return 1 + sum([sp.page_count() for sp in self.subpages])
-        else:
-            return 1
+        '''Count this page and all subpages.'''
+        return self.aggregate_stats()[0]
+
+    def total_vids(self) -> int:
+        '''Count videos and clips in this page and all subpages.'''
+        return self.aggregate_stats()[1]
+
+    def total_imgs(self) -> int:
+        '''Count images in this page and all subpages.'''
+        return self.aggregate_stats()[2]
+
+    def total_size(self) -> int:
+        '''Size in bytes of all media files in this page and all subpages.'''
+        return self.aggregate_stats()[3]
+
+    def aggregate_stats(self) -> tuple[int, int, int, int]:
+        '''(pages, videos, images, bytes) for this page and all subpages, counted in one 
+            iterative walk. Cached because the tree is not modified after scanning.
+        '''
+        if self._stats is None:
+            pages, vids, imgs, size = 0, 0, 0, 0
+            stack = [self]
+            while stack:
+                page = stack.pop()
+                pages += 1
+                vids += len(page.videos) + len(page.clips)
+                imgs += len(page.images)
+                size += sum(vi.file_size() for vi in page.videos)
+                size += sum(vi.file_size() for vi in page.clips)
+                size += sum(ii.file_size() for ii in page.images)
+                stack.extend(page.subpages or ())
+            self._stats = (pages, vids, imgs, size)
+        return self._stats
 
     ############################################ Dunder methods ############################################
     def __repr__(self) -> str:
@@ -15,25 +15,38 @@ from collections import defaultdict
 #    "/documents/work/report.docx",
 #]
 
-import glob
-
-file_paths = glob.glob('/AddStorage/personal/dwhelper/**/*.mp4', recursive=True)
+root_path = '/AddStorage/personal/dwhelper'
 
 # Recursive defaultdict for tree
 def make_tree():
     return defaultdict(make_tree)
 
-# Insert a path into the tree
-def insert_path(tree, path):
-    parts = path.strip(os.sep).split(os.sep)
-    for part in parts[:-1]:  # all directories
-        tree = tree[part]
-    tree[parts[-1]] = None  # file
-
-# Build tree
+# Build tree during a single scandir walk: the parent node is known from the
+# walk state, so paths never need to be split.
 tree = make_tree()
-for path in file_paths:
-    insert_path(tree, path)
+root_node = tree
+for part in root_path.strip(os.sep).split(os.sep):
+    root_node = root_node[part]
+
+added_dirs = []
+stack = [(root_path, root_node)]
+while stack:
+    dirpath, node = stack.pop()
+    with os.scandir(dirpath) as it:
+        for entry in it:
+            if entry.name.startswith('.'): # glob skips hidden files
+                continue
+            if entry.is_dir():
+                child = node[entry.name] = make_tree()
+                added_dirs.append((node, entry.name))
+                stack.append((entry.path, child))
+            elif entry.is_file() and entry.name.endswith('.mp4'):
+                node[entry.name] = None  # file
+
+# drop directories without any .mp4 files (children come after parents in added_dirs)
+for node, name in reversed(added_dirs):
+    if not node[name]:
+        del node[name]
 
 # Optional: Pretty print the tree
 #def print_tree(d, indent=0):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 import pathlib
+import os
+import functools
 import dataclasses
 import typing
 import jinja2
@@ -8,8 +10,9 @@ if typing.TYPE_CHECKING:
     from .vidinfo import VidInfo
     from .imginfo import ImgInfo
 
-DEFAULT_VIDEO_EXTENSIONS = ('mp4', 'mov', 'm4v', 'flv', 'ts', 'webm', 'mkv', 'avi', 'wmv', 'm4v', 'vob', '3gp', '3g2', 'm2ts', 'mts', 'mxf', 'ogv', 'ogg', 'rm', 'rmvb', 'flv', 'f4v', 'asf', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mpg', 'mpeg', 'mpe', 'mpv', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'mpg', 'mpeg', 'm2v', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'avi', 'wmv', 'asf', 'qt', 'mov', 'rm', 'rmvb', 'flv', 'f4v', 'swf', 'avchd', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mts', 'mxf', 'ogg', 'ogv', 'ogm', 'rm', 'rmvb', 'flv', 'f4v', 'asf', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mpg', 'mpeg', 'mpe', 'mpv', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'mpg', 'mpeg', 'm2v', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'avi', 'wmv', 'asf', 'qt', 'mov', 'rm', 'rmvb', 'flv', 'f4v', 'swf', 'avchd', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2')
-DEFAULT_IMAGE_EXTENSIONS = ('png', 'gif', 'jpg', 'jpeg', 'svg', 'bmp', 'tiff', 'webp', 'ico', 'jpe', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k')
+# the raw lists repeat many extensions; dict.fromkeys drops repeats and keeps order
+DEFAULT_VIDEO_EXTENSIONS = tuple(dict.fromkeys(('mp4', 'mov', 'm4v', 'flv', 'ts', 'webm', 'mkv', 'avi', 'wmv', 'm4v', 'vob', '3gp', '3g2', 'm2ts', 'mts', 'mxf', 'ogv', 'ogg', 'rm', 'rmvb', 'flv', 'f4v', 'asf', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mpg', 'mpeg', 'mpe', 'mpv', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'mpg', 'mpeg', 'm2v', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'avi', 'wmv', 'asf', 'qt', 'mov', 'rm', 'rmvb', 'flv', 'f4v', 'swf', 'avchd', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mts', 'mxf', 'ogg', 'ogv', 'ogm', 'rm', 'rmvb', 'flv', 'f4v', 'asf', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2v', 'm2t', 'm2ts', 'mpg', 'mpeg', 'mpe', 'mpv', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'mpg', 'mpeg', 'm2v', 'mp2v', 'mp2', 'm2p', 'mp4v', 'mp4', 'm4p', 'm4v', 'avi', 'wmv', 'asf', 'qt', 'mov', 'rm', 'rmvb', 'flv', 'f4v', 'swf', 'avchd', 'webm', 'wtv', 'dvr-ms', 'm1v', 'm2')))
+DEFAULT_IMAGE_EXTENSIONS = tuple(dict.fromkeys(('png', 'gif', 'jpg', 'jpeg', 'svg', 'bmp', 'tiff', 'webp', 'ico', 'jpe', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k', 'jpf', 'jpx', 'jpm', 'mj2', 'svgz', 'tif', 'tiff', 'jfif', 'jp2', 'j2k')))
 
 
 @dataclasses.dataclass
@@ -25,8 +28,8 @@ class SiteConfig:
     thumb_extension: str = '.gif'
     thumb_path: pathlib.Path | str | None = None
 
-    vid_extensions: tuple[str, ...] = DEFAULT_VIDEO_EXTENSIONS
-    img_extensions: tuple[str, ...] = DEFAULT_IMAGE_EXTENSIONS
+    vid_extensions: tuple[str, ...] | frozenset[str] = DEFAULT_VIDEO_EXTENSIONS
+    img_extensions: tuple[str, ...] | frozenset[str] = DEFAULT_IMAGE_EXTENSIONS
 
     video_sort_key: typing.Callable[[VidInfo], typing.Any] | None = None
     clip_sort_key: typing.Callable[[VidInfo], typing.Any] | None = None
@@ -37,26 +40,47 @@ class SiteConfig:
 
     max_depth: int | None = None
 
+    thumb_stat: os.stat_result | None = dataclasses.field(default=None, init=False, repr=False)
+
     def __post_init__(self) -> None:
         '''Post init checks and conversions.'''
         self.root_path = pathlib.Path(self.root_path)
         self.thumb_path = pathlib.Path(self.thumb_path) if self.thumb_path else self.root_path.joinpath('_thumbs/')
 
+        # normalized once so scanners can test each file's extension with a set lookup
+        self.vid_extensions = frozenset(e.lower().lstrip('.') for e in self.vid_extensions)
+        self.img_extensions = frozenset(e.lower().lstrip('.') for e in self.img_extensions)
+
         self.thumb_path.relative_to(self.root_path) # raise error if not relative. Must be relative.
+
+        self._thumb_path_str = str(self.thumb_path)
+        try:
+            self.thumb_stat = os.stat(self.thumb_path)
+        except OSError:
+            self.thumb_stat = None # not created yet; is_thumb_dir compares paths only
     
+    def is_thumb_dir(self, entry: os.DirEntry) -> bool:
+        '''Check whether a directory entry is the thumbnail folder. Matches by path, or by 
+            inode so other spellings of the folder are caught. The inode comes free from 
+            readdir; a stat is only made for symlinks or when the inode already matches.
+        '''
+        if entry.path == self._thumb_path_str:
+            return True
+        ts = self.thumb_stat
+        if ts is None:
+            return False
+        if not entry.is_symlink() and entry.inode() != ts.st_ino:
+            return False
+        return os.path.samestat(entry.stat(), ts)
+
     def vid_to_thumb_path(self, vid_path: pathlib.Path) -> pathlib.Path:
         '''Get absolute or relative thumb path from vid path.'''
-        with_suffix = vid_path.with_suffix(self.thumb_extension)
-
-        
-        thumb_fname = str(with_suffix).replace('/', '.')
-        
-        
-        return self.thumb_path.joinpath(vid_path.stem + self.thumb_extension)
+        return pathlib.Path(_thumb_path_for(str(self.thumb_path), pathlib.PurePath(vid_path).stem, self.thumb_extension))
     
     def rel_vid_to_rel_thumb(self, vid_path: pathlib.Path) -> pathlib.Path:
         '''Get relative thumb path from vid path.'''
-        return self.vid_to_thumb_path(vid_path).relative_to(self.root_path)
+        thumb_path = _thumb_path_for(str(self.thumb_path), pathlib.PurePath(vid_path).stem, self.thumb_extension)
+        return pathlib.Path(_rel_path_for(str(self.root_path), thumb_path))
 
     #def thumb_path_rel(self) -> pathlib.Path:
     #    '''Thumb path relative to base path.'''
@@ -76,7 +100,7 @@ class SiteConfig:
     
     def abs_to_rel(self, fpath: pathlib.Path) -> pathlib.Path:
         '''Convert absolute path to relative path.'''
-        return fpath.relative_to(self.root_path)
+        return pathlib.Path(_rel_path_for(str(self.root_path), str(fpath)))
     
     def rel_to_abs(self, fpath: pathlib.Path) -> pathlib.Path:
         '''Convert relative path to absolute path.'''
@@ -102,3 +126,16 @@ class SiteConfig:
     #    clip_duration = 60,
     #    do_clip_autoplay = False,
     #)
+
+
+# thumb and relative paths are requested many times per video during scanning, rendering and 
+# thumbnail generation; caching on strings avoids re-parsing the same paths each time
+
+@functools.lru_cache(maxsize=8192)
+def _thumb_path_for(thumb_root: str, vid_stem: str, ext: str) -> str:
+    return os.path.join(thumb_root, vid_stem + ext)
+
+@functools.lru_cache(maxsize=8192)
+def _rel_path_for(root: str, path: str) -> str:
+    '''Path relative to root, raising ValueError if it is not inside root (like Path.relative_to).'''
+    return str(pathlib.PurePath(path).relative_to(root))
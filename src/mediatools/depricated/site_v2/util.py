@@ -4,29 +4,103 @@ import urllib.parse
 import jinja2
 import pathlib
 import os
+import re
+import functools
+import typing
+import concurrent.futures
 from collections import defaultdict
 
+T = typing.TypeVar('T')
 
+
+_TITLE_TRANS = str.maketrans('_-', '  ')
+_WS_RE = re.compile(r'\s+') # same whitespace set as str.split()
+
+@functools.lru_cache(maxsize=4096)
 def fname_to_title(fname: str, max_char: int = 150) -> str:
     """Convert a file name to a human-readable title."""
-    replaced = fname.replace('_', ' ').replace('-', ' ')
-    return ' '.join(replaced.strip().split()).title()[:max_char]
+    return _WS_RE.sub(' ', fname.translate(_TITLE_TRANS).strip()).title()[:max_char]
 
+@functools.lru_cache(maxsize=4096)
 def fname_to_id(fname: str) -> str:
     """Convert a file name to a URL-friendly ID."""
-    return '-'.join(fname.strip().split())
+    return _WS_RE.sub('-', fname.strip())
 
 def parse_url(urlstr: str) -> str:
     """Parse a URL string and return a properly encoded URL."""
     try:
-        return urllib.parse.quote(urlstr)
-    except TypeError as e:
+        return _quote_cached(urlstr)
+    except TypeError as e: # also raised by the cache for unhashable input
         return ''
 
-def read_template(template_path: str | pathlib.Path) -> jinja2.Template:
-    '''Read template file and return jinja2 template object.'''
-    with pathlib.Path(template_path).open('r') as f:
-        template_html = f.read()
-    environment = jinja2.Environment()
-    return environment.from_string(template_html)
+@functools.lru_cache(maxsize=8192)
+def _quote_cached(urlstr: str) -> str:
+    '''Media paths are quoted again for every render that links to them.'''
+    return urllib.parse.quote(urlstr)
+
+_BYTECODE_CACHE_DIR = pathlib.Path('~/.cache/mediatools_jinja').expanduser()
+
+def read_template(template_path: str | pathlib.Path, bytecode_cache: bool = True) -> jinja2.Template:
+    '''Read template file and return jinja2 template object. Compiled templates 
+        are cached until the file's modification time changes. With bytecode_cache, 
+        compiled code is also stored on disk so later runs skip compilation; turn 
+        it off for very small sites where the disk round trip does not pay off.
+    '''
+    template_path = os.path.abspath(template_path)
+    return _read_template_cached(template_path, os.path.getmtime(template_path), bytecode_cache)
+
+@functools.lru_cache(maxsize=128)
+def _read_template_cached(template_path: str, mtime: float, bytecode_cache: bool) -> jinja2.Template:
+    '''Load template through the environment for its directory. mtime is part of the cache key only.'''
+    template_dir, name = os.path.split(template_path)
+    return _template_env(template_dir, bytecode_cache).get_template(name)
+
+@functools.lru_cache(maxsize=32)
+def _template_env(template_dir: str, bytecode_cache: bool) -> jinja2.Environment:
+    '''One environment per template directory so compiled templates are shared.'''
+    return jinja2.Environment(
+        loader = jinja2.FileSystemLoader(template_dir),
+        bytecode_cache = _bytecode_cache() if bytecode_cache else None,
+        autoescape = False, # context values are already url-quoted where needed
+        enable_async = False,
+        optimized = True,
+    )
+
+@functools.lru_cache(maxsize=1)
+def _bytecode_cache() -> jinja2.BytecodeCache | None:
+    '''Bytecode cache shared by all environments, or None if the directory cannot be created.'''
+    try:
+        _BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return jinja2.FileSystemBytecodeCache(str(_BYTECODE_CACHE_DIR))
+
+
+def default_io_workers() -> int:
+    '''Thread count for I/O bound work (stat, header reads, ffprobe subprocesses).'''
+    return min(32, (os.cpu_count() or 1)*4)
+
+_SKIPPED = object()
+
+def thread_map(
+    func: typing.Callable[[pathlib.Path], T], 
+    paths: typing.Iterable[pathlib.Path], 
+    max_workers: int | None = None,
+    skip_errors: tuple[type[Exception], ...] = (),
+) -> list[T]:
+    '''Apply func to each path in a thread pool, returning results in input order.
+        Paths for which func raises one of skip_errors are left out of the result.
+    '''
+    def call(p):
+        try:
+            return func(p)
+        except skip_errors:
+            return _SKIPPED
 
+    paths = list(paths)
+    if len(paths) <= 1:
+        results = [call(p) for p in paths]
+    else:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers or default_io_workers()) as executor:
+            results = list(executor.map(call, paths))
+    return [r for r in results if r is not _SKIPPED]
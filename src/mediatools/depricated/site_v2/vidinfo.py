@@ -3,13 +3,15 @@ import typing
 
 import dataclasses
 import pathlib
+import os
 
 from .baseinfo import BaseInfo
 from .siteconfig import SiteConfig
-from ..video import VideoFile, ProbeInfo
-from ..util import multi_extension_glob
+from .util import fname_to_title, parse_url, thread_map
+from ..video import VideoFile, ProbeInfo, ProbeError
+from ..util import iter_multi_ext_entries
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class VidInfo(BaseInfo):
     '''Info about a single video.'''
     vf: VideoFile
@@ -21,23 +23,49 @@ class VidInfo(BaseInfo):
         cls, 
         path: pathlib.Path, 
         config: SiteConfig, 
+        max_workers: int | None = None,
     ) -> list[typing.Self]:
-        '''Scan directory for video files and return list of info objects.'''
-        return [cls.from_path(fp, config) for fp in multi_extension_glob(path.glob, config.vid_extensions)]
+        '''Scan directory for video files and return list of info objects. Each probe 
+            runs an ffprobe subprocess, so files are probed concurrently in a thread pool. 
+            Files that cannot be probed are skipped.
+        '''
+        entries = sorted(iter_multi_ext_entries(path, config.vid_extensions, recursive=False), key=lambda e: e.name)
+        return thread_map(
+            lambda e: cls.from_path(pathlib.Path(e.path), config, stat_result=e.stat()), 
+            entries, 
+            max_workers=max_workers,
+            skip_errors=(ProbeError,),
+        )
 
     @classmethod
-    def from_path(cls, vpath: pathlib.Path, config: SiteConfig) -> typing.Self:
-        '''Get video information by probing video file.'''
-        vpath = pathlib.Path(vpath)
+    def from_path(cls, vpath: pathlib.Path, config: SiteConfig, stat_result: os.stat_result | None = None) -> typing.Self:
+        '''Get video information by probing video file. stat_result can be passed if already known.'''
+        vpath = vpath if isinstance(vpath, pathlib.Path) else pathlib.Path(vpath) # avoid re-parsing existing Paths
 
-        vf = VideoFile.from_path(vpath)
-        return cls(
+        # a stat result means the scan already saw the file, so skip the existence checks
+        vf = VideoFile.from_path(vpath, check_exists=stat_result is None)
+        o = cls(
             vf = vf,
             config = config,
             probe = vf.probe(),
         )
+        if stat_result is not None:
+            o._stat = stat_result
+        return o
+
+    @property
+    def fpath(self) -> pathlib.Path:
+        return self.vf.path
 
     def is_clip(self) -> bool:
         '''Check if video is a clip.'''
         return self.probe.duration <= self.config.max_clip_duration
 
+    def info_dict(self) -> typing.Dict[str, str|int|float]:
+        return {
+            'path': parse_url(self.fpath.name),
+            'title': fname_to_title(self.fpath.stem),
+            'thumb': parse_url('/'+str(self.config.rel_vid_to_rel_thumb(self.fpath))),
+            'duration': self.probe.duration,
+        }
+
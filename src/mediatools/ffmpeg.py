@@ -14,7 +14,11 @@ from .video.ffmpeg import (
     ffoutput,
     FFOutput,
     FFOutputArgs,
+    HWAccelConfig,
     run_ffmpeg_subprocess,
+    run_ffmpeg_subprocess_async,
+    arun_many,
+    ffmpeg_many,
     filtergraph_link,
     filter_link,
     filterchain,
@@ -46,12 +50,16 @@ __all__ = [
     "VideoStreamInfo",
     "AudioStreamInfo",
     "run_ffmpeg_subprocess",
+    "run_ffmpeg_subprocess_async",
+    "arun_many",
+    "ffmpeg_many",
     "filtergraph_link",
     "filter_link",
     "filterchain",
     "filtergraph",
     "FFInputArgs",
     "FFOutputArgs",
+    "HWAccelConfig",
     "FFInput",
     "FFOutput",
 ]
@@ -24,7 +24,7 @@ class FileBase:
         meta: dict[str, pydantic.JsonValue] | None = None,
     ) -> typing.Self:
         """Create a file instance from a path."""
-        fp = Path(path)
+        fp = path if isinstance(path, Path) else Path(path) # avoid re-parsing existing Paths
         if check_exists and not fp.exists():
             raise FileNotFoundError(f'The file "{fp}" was not found.')
         return cls(path=fp, meta=meta or {})
@@ -0,0 +1,48 @@
+'''Optional numba kernels for image distances. HAS_NUMBA is False when numba is not installed.'''
+from __future__ import annotations
+import math
+import numpy as np
+
+try:
+    import numba # type: ignore
+    from numba import prange # type: ignore
+    HAS_NUMBA = True
+except ImportError:
+    prange = range
+    HAS_NUMBA = False
+
+
+def _sobel_sq_diff_2d(a: np.ndarray, b: np.ndarray) -> float:
+    '''Sum over pixels of (sobel(a) - sobel(b))**2 for 2D float images.
+        Matches skimage.filters.sobel: separable [1,2,1]/4 smoothing, reflect
+        boundary mode, and magnitude sqrt((gy**2 + gx**2)/2).
+    '''
+    h, w = a.shape
+    total = 0.0
+    for i in prange(h):
+        iu = i - 1 if i > 0 else 0
+        idn = i + 1 if i < h - 1 else h - 1
+        for j in range(w):
+            jl = j - 1 if j > 0 else 0
+            jr = j + 1 if j < w - 1 else w - 1
+
+            gy = (0.25*a[iu, jl] + 0.5*a[iu, j] + 0.25*a[iu, jr]) - (0.25*a[idn, jl] + 0.5*a[idn, j] + 0.25*a[idn, jr])
+            gx = (0.25*a[iu, jl] + 0.5*a[i, jl] + 0.25*a[idn, jl]) - (0.25*a[iu, jr] + 0.5*a[i, jr] + 0.25*a[idn, jr])
+            sa = math.sqrt((gy*gy + gx*gx) / 2.0)
+
+            gy = (0.25*b[iu, jl] + 0.5*b[iu, j] + 0.25*b[iu, jr]) - (0.25*b[idn, jl] + 0.5*b[idn, j] + 0.25*b[idn, jr])
+            gx = (0.25*b[iu, jl] + 0.5*b[i, jl] + 0.25*b[idn, jl]) - (0.25*b[iu, jr] + 0.5*b[i, jr] + 0.25*b[idn, jr])
+            sb = math.sqrt((gy*gy + gx*gx) / 2.0)
+
+            d = sa - sb
+            total += d*d
+    return total
+
+if HAS_NUMBA:
+    _sobel_sq_diff_2d = numba.njit(parallel=True, fastmath=True, cache=True)(_sobel_sq_diff_2d)
+
+
+def sobel_sq_diff(a: np.ndarray, b: np.ndarray) -> float:
+    '''Euclidean distance between sobel filtered 2D float images in one fused pass.'''
+    return math.sqrt(_sobel_sq_diff_2d(a, b))
+
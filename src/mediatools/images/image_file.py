@@ -1,27 +1,69 @@
 from __future__ import annotations
 import dataclasses
 import typing
+import os
 import skimage # type: ignore
 import numpy as np
 #import pathlib
 from pathlib import Path
 import pydantic
 
-from .image import Image
+from .image import Image, ImageBackend
 from ..file_base import FileBase
-from .image_meta import ImageMeta
+from ..file_stat_result import FileStatResult
+from .image_meta import ImageMeta, read_image_dims
 
-@dataclasses.dataclass(frozen=True, repr=True, slots=True)
+@dataclasses.dataclass(frozen=True, repr=True, slots=True, eq=False)
 class ImageFile(FileBase):
-    '''Represents an image file.'''
+    '''Represents an image file. Equality and hashing use the path only.'''
     path: Path
     meta: dict[str, pydantic.JsonValue] = dataclasses.field(default_factory=dict)
+    _prefetched_stat: os.stat_result | None = dataclasses.field(default=None, compare=False, repr=False)
 
-    def read(self) -> Image:
-        '''Read the image into memory.'''
-        return Image.from_file(self.path)
+    @classmethod
+    def from_path(cls,
+        path: str | Path,
+        check_exists: bool = True,
+        meta: dict[str, pydantic.JsonValue] | None = None,
+        stat_result: os.stat_result | None = None,
+    ) -> typing.Self:
+        '''Create an image file from a path. Pass stat_result (e.g. from a scandir walk) to 
+            skip the existence check and reuse it for stat() and size().
+        '''
+        fp = path if isinstance(path, Path) else Path(path) # avoid re-parsing existing Paths
+        if check_exists and stat_result is None and not fp.exists():
+            raise FileNotFoundError(f'The file "{fp}" was not found.')
+        return cls(path=fp, meta=meta or {}, _prefetched_stat=stat_result)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ImageFile):
+            return NotImplemented
+        return self.path == other.path
+
+    def __hash__(self) -> int:
+        return hash(self.path)
+
+    def read(self, dtype: type[np.generic] | None = None, backend: ImageBackend = 'pil') -> Image:
+        '''Read the image into memory, optionally converting to dtype (see Image.from_file).'''
+        return Image.from_file(self.path, dtype=dtype, backend=backend)
+
+    def probe_size(self) -> typing.Tuple[int, int]:
+        '''Get (width, height) from the file header without decoding pixels.'''
+        return read_image_dims(self.path)
 
     def read_meta(self) -> ImageMeta:
         '''Get the image information for this image file.'''
         return ImageMeta.from_image_file(self)
+
+    def size(self) -> int:
+        '''Get the file size in bytes, using the prefetched stat if available.'''
+        if self._prefetched_stat is not None:
+            return self._prefetched_stat.st_size
+        return self.path.stat().st_size
+
+    def stat(self) -> FileStatResult:
+        '''Get the file's stat result, using the prefetched stat if available.'''
+        if self._prefetched_stat is not None:
+            return FileStatResult.from_os_stat_result(self._prefetched_stat)
+        return FileStatResult.read_from_path(self.path)
     
\ No newline at end of file
@@ -1,17 +1,20 @@
 from __future__ import annotations
 import dataclasses
 import typing
+import collections
+import os
+import concurrent.futures
 import skimage # type: ignore
 import numpy as np
 #import pathlib
 from pathlib import Path
 
 
-from ..util import multi_extension_glob
+from ..util import single_pass_multi_ext_rglob, iter_multi_ext_entries
 from .image import Image
 from .image_file import ImageFile
 
-DEFAULT_IMAGE_FILE_EXTENSIONS = ('jpg', 'JPG', 'jpeg', 'JPEG', 'png', 'PNG', 'bmp', 'BMP', 'gif', 'GIF', 'tiff', 'TIFF', 'tif', 'TIF')
+DEFAULT_IMAGE_FILE_EXTENSIONS = ('jpg', 'jpeg', 'png', 'bmp', 'gif', 'tiff', 'tif')
 
 class ImageFiles(list[ImageFile]):
     '''Collection of image files.'''
@@ -21,44 +24,86 @@ class ImageFiles(list[ImageFile]):
         root: str | Path, 
         extensions: typing.Tuple[str, ...] = DEFAULT_IMAGE_FILE_EXTENSIONS,
         base_name_pattern: str = '*',
+        prefetch_stat: bool = False,
     ) -> typing.Self:
-        '''Get sorted list of video files from a given directory recursively.
+        '''Get sorted list of image files from a given directory recursively.
         Args:
-            root: root path from which to search for videos.
+            root: root path from which to search for images.
             extensions: list of file extensions to search for.
-            filter_invalid: include only video files that could be successfully probed.
+            base_name_pattern: pattern for the file name without extension.
+            prefetch_stat: stat files during the walk so size() and stat() are served from memory.
         '''
-        paths = multi_extension_glob(
-            glob_func=Path(root).rglob, # type: ignore
-            extensions=extensions, 
-            base_name_pattern=base_name_pattern,
-        )
-        return cls([ImageFile(fp) for fp in paths])
+        return cls._from_scan(root, extensions, base_name_pattern, recursive=True, prefetch_stat=prefetch_stat)
 
     @classmethod
     def from_glob(cls, 
         root: str | Path, 
         extensions: typing.Tuple[str, ...] = DEFAULT_IMAGE_FILE_EXTENSIONS,
         base_name_pattern: str = '*',
+        prefetch_stat: bool = False,
     ) -> typing.Self:
-        '''Get sorted list of video files from a given directory recursively.
+        '''Get sorted list of image files from a given directory (not recursive).
         Args:
-            root: root path from which to search for videos.
+            root: root path from which to search for images.
             extensions: list of file extensions to search for.
-            filter_invalid: include only video files that could be successfully probed.
+            base_name_pattern: pattern for the file name without extension.
+            prefetch_stat: stat files during the walk so size() and stat() are served from memory.
         '''
-        paths = multi_extension_glob(
-            glob_func=Path(root).glob, # type: ignore
-            extensions=extensions, 
-            base_name_pattern=base_name_pattern,
+        return cls._from_scan(root, extensions, base_name_pattern, recursive=False, prefetch_stat=prefetch_stat)
+
+    @classmethod
+    def _from_scan(cls, 
+        root: str | Path, 
+        extensions: typing.Tuple[str, ...],
+        base_name_pattern: str,
+        recursive: bool,
+        prefetch_stat: bool,
+    ) -> typing.Self:
+        '''Build from a single scandir walk, sorted by path.'''
+        entries = sorted(
+            ((Path(e.path), e) for e in iter_multi_ext_entries(root, extensions, base_name_pattern, recursive)),
+            key=lambda pe: pe[0],
         )
-        return cls([ImageFile(fp) for fp in paths])
+        return cls([
+            ImageFile.from_path(fp, check_exists=False, stat_result=e.stat() if prefetch_stat else None) 
+            for fp, e in entries
+        ])
 
+    def paths(self) -> np.ndarray:
+        '''File paths as a contiguous array of strings for vectorized operations.'''
+        return np.array([str(imf.path) for imf in self], dtype=np.str_)
+
+    def sizes(self) -> np.ndarray:
+        '''File sizes in bytes as an int64 array. Uses prefetched stats where available.'''
+        return np.fromiter((imf.size() for imf in self), dtype=np.int64, count=len(self))
+
+    def total_size(self) -> int:
+        '''Total size of all files in bytes.'''
+        return int(self.sizes().sum())
 
     def read_all(self) -> typing.Generator[Image]:
         '''Read the images into memory as a generator.'''
         for img in self:
             yield img.read()
+
+    def read_all_parallel(self, max_workers: int | None = None, prefetch: int | None = None) -> typing.Generator[Image]:
+        '''Read the images in order using a thread pool (image decoding releases the GIL).
+        Args:
+            max_workers: number of reader threads. Defaults to the ThreadPoolExecutor default.
+            prefetch: max number of images decoded ahead of the consumer. Defaults to 2*max_workers.
+        '''
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        if prefetch is None:
+            prefetch = 2*max_workers
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: collections.deque[concurrent.futures.Future[Image]] = collections.deque()
+            for imf in self:
+                pending.append(executor.submit(imf.read))
+                if len(pending) >= prefetch:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
     
     def to_dict(self) -> ImageFilesDict:
         '''Convert to ImageFilesDict.'''
@@ -80,10 +125,11 @@ class ImageFilesDict(dict[Path, ImageFile]):
             extensions: list of file extensions to search for.
             filter_invalid: include only video files that could be successfully probed.
         '''
-        paths = multi_extension_glob(
-            glob_func=Path(root).rglob, # type: ignore
+        paths = single_pass_multi_ext_rglob(
+            root=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=True,
         )
         return cls({fp: ImageFile(fp) for fp in paths})
 
@@ -99,10 +145,11 @@ class ImageFilesDict(dict[Path, ImageFile]):
             extensions: list of file extensions to search for.
             filter_invalid: include only video files that could be successfully probed.
         '''
-        paths = multi_extension_glob(
-            glob_func=Path(root).glob, # type: ignore
+        paths = single_pass_multi_ext_rglob(
+            root=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=False,
         )
         return cls({fp: ImageFile(fp) for fp in paths})
 
@@ -10,6 +10,7 @@ import tqdm
 import sys
 import html
 import urllib.parse
+import struct
 from PIL import Image
 import pydantic
 from pathlib import Path
@@ -30,9 +31,8 @@ class ImageMeta(pydantic.BaseModel):
     @classmethod
     def from_image_file(cls, ifile: ImageFile) -> typing.Self:
         '''Get video information by probing video file.'''
-        stat = FileStatResult.read_from_path(ifile.path)
-        im = Image.open(str(ifile.path))
-        width, height = im.size
+        stat = ifile.stat()
+        width, height = read_image_dims(ifile.path)
      
         return cls(
             path = ifile.path,
@@ -45,8 +45,7 @@ class ImageMeta(pydantic.BaseModel):
     def from_path(cls, path: pathlib.Path) -> typing.Self:
         '''Get image information by probing image file.'''
         stat = FileStatResult.read_from_path(path)
-        im = Image.open(str(path))
-        width, height = im.size
+        width, height = read_image_dims(path)
         return cls(
             path = path,
             meta = {},
@@ -65,3 +64,60 @@ class ImageMeta(pydantic.BaseModel):
         '''Get the ID of the image file.'''
         return fname_to_id(self.path.stem)
         
+
+
+def read_image_dims(path: pathlib.Path) -> typing.Tuple[int, int]:
+    '''Get (width, height) of an image, parsing the header directly when possible.'''
+    dims = _read_dims_fast(path)
+    if dims is None:
+        with Image.open(str(path)) as im:
+            dims = im.size
+    return dims
+
+# JPEG start-of-frame markers (excludes DHT=C4, JPG=C8, DAC=CC)
+_JPEG_SOF_MARKERS = frozenset((0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF))
+
+def _read_dims_fast(path: pathlib.Path) -> typing.Tuple[int, int] | None:
+    '''Read (width, height) from PNG, GIF, BMP, or JPEG headers. Returns None if not recognized.'''
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head[:8] == b'\x89PNG\r\n\x1a\n' and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        elif head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        elif head[:2] == b'BM' and len(head) >= 26:
+            if struct.unpack('<I', head[14:18])[0] == 12: # OS/2 BITMAPCOREHEADER
+                return struct.unpack('<HH', head[18:22])
+            w, h = struct.unpack('<ii', head[18:26])
+            return w, abs(h) # negative height means top-down rows
+        elif head[:2] == b'\xff\xd8':
+            f.seek(2)
+            return _read_jpeg_dims(f)
+    return None
+
+def _read_jpeg_dims(f: typing.BinaryIO) -> typing.Tuple[int, int] | None:
+    '''Walk JPEG marker segments until a start-of-frame segment is found.'''
+    while True:
+        b = f.read(1)
+        while b and b != b'\xff':
+            b = f.read(1)
+        while b == b'\xff': # fill bytes
+            b = f.read(1)
+        if not b:
+            return None
+        marker = b[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8: # standalone markers
+            continue
+        if marker in (0xD9, 0xDA): # end of image or start of scan before any frame header
+            return None
+        seg = f.read(2)
+        if len(seg) < 2:
+            return None
+        length = struct.unpack('>H', seg)[0]
+        if marker in _JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            h, w = struct.unpack('>HH', data[1:5])
+            return w, h
+        f.seek(length - 2, os.SEEK_CUR)
@@ -1,23 +1,44 @@
 from __future__ import annotations
 import typing
+import os
 import pathlib
 import dataclasses
+import concurrent.futures
 from pathlib import Path
 from .video import VideoFile, VideoFiles, VideoFilesDict
 from .images import ImageFile, ImageFiles, ImageFilesDict
-from .video import VideoMeta
 import pydantic
 from .file_base import FileBase
 
-from .util import build_file_tree, hash_file
+from .util import hash_files
 from .constants import VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS
 
+def _build_ext_kind(video_ext: typing.Iterable[str], image_ext: typing.Iterable[str]) -> dict[str, str]:
+    '''Map lowercase extensions (without dot) to 'video' or 'image'. Video wins if listed in both.'''
+    return {e.lower().lstrip('.'): 'image' for e in image_ext} | {e.lower().lstrip('.'): 'video' for e in video_ext}
+
+_EXT_KIND = _build_ext_kind(VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS)
+
+def _concat_values(dicts: typing.Iterable[dict]) -> list:
+    '''Concatenate dict values into one list.
+        list.extend on a dict view grows the list once per dict because the view 
+        has a known length; this measured faster than pre-sizing with [None]*n.
+    '''
+    out = list()
+    for d in dicts:
+        out.extend(d.values())
+    return out
+
+# thread pool overhead is not worth it for shallow trees
+_MIN_PARALLEL_SUBDIRS = 4
+
 def scan_directory(
         root_path: pathlib.Path | str,
         use_absolute: bool = True,
         video_ext: typing.Iterable[str] = VIDEO_FILE_EXTENSIONS,
         image_ext: typing.Iterable[str] = IMAGE_FILE_EXTENSIONS,
         ignore_path: typing.Callable[[Path],bool] | None = None,
+        workers: int = 16,
     ) -> MediaDir:
     '''Recursively scan a directory and return a MediaDir instance.'''
     return MediaDir.from_path(
@@ -26,6 +47,7 @@ def scan_directory(
         video_ext=video_ext,
         image_ext=image_ext,
         ignore_path=ignore_path,
+        workers=workers,
     )
 
 def display_directory_tree(
@@ -38,7 +60,7 @@ def display_directory_tree(
     return mdir.display(show_files=show_files, show_file_types=show_file_types)
 
 
-@dataclasses.dataclass(repr=False)
+@dataclasses.dataclass(repr=False, slots=True)
 class MediaDir:
     '''Stores information about a directory of media files (recursive data structure).
     Note: this type can represent either absolute or relative paths. When using absolute paths,
@@ -51,6 +73,8 @@ class MediaDir:
     _subdirs: dict[str, typing.Self]
     parent: typing.Self | None = None
     meta: dict[str, pydantic.JsonValue] = dataclasses.field(default_factory=dict)
+    _cache: dict[str, typing.Any] = dataclasses.field(default_factory=dict, init=False, compare=False)
+    _raw: dict | None = dataclasses.field(default=None, init=False, compare=False)
 
     @classmethod
     def from_path(
@@ -62,6 +86,7 @@ class MediaDir:
         ignore_path: typing.Callable[[Path],bool] | None = None,
         #ingore_folder_names: set[str] | None = None,
         meta: dict | None = None,
+        workers: int = 16,
     ) -> typing.Self:
         '''Create a MediaDir instance from the current working directory.
         Args:
@@ -71,6 +96,8 @@ class MediaDir:
             image_ext (typing.Iterable[str]): Iterable of image file extensions to consider.
             ignore_path (typing.Callable[[Path],bool] | None): Optional function to ignore certain directories.
             meta (dict | None): Optional metadata dictionary to associate with the MediaDir.
+            workers (int): Max threads used to scan directories concurrently. Only used when 
+                the root has more than a few subdirectories; 1 scans serially.
         Returns:
             MediaDir: The created MediaDir instance.
         '''
@@ -78,18 +105,93 @@ class MediaDir:
         if not root_path.is_dir():
             raise FileNotFoundError(f'Root path not found: {root_path}')
         
+        if video_ext is VIDEO_FILE_EXTENSIONS and image_ext is IMAGE_FILE_EXTENSIONS:
+            ext_kind = _EXT_KIND
+        else:
+            ext_kind = _build_ext_kind(video_ext, image_ext)
 
-        file_tree = build_file_tree(root_path)
-        return cls.from_file_tree(
-            data=file_tree,
+        root = cls.empty(
             path=root_path if use_absolute else pathlib.Path('.'),
-            video_ext=set([ext.lower() for ext in video_ext]),
-            image_ext=set([ext.lower() for ext in image_ext]),
-            check_exists=False,
-            ignore_path=ignore_path,
             meta=meta if meta is not None else dict(),
         )
 
+        # one scandir per directory; each task only writes to its own node
+        nodes = [root]
+        stack = root._scan(str(root_path), ext_kind, ignore_path)
+        nodes.extend(subdir for _, subdir in stack)
+        if workers > 1 and len(stack) > _MIN_PARALLEL_SUBDIRS:
+            # directory I/O latency dominates (especially on network filesystems)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                pending = {executor.submit(node._scan, sp, ext_kind, ignore_path) for sp, node in stack}
+                while pending:
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for fut in done:
+                        found = fut.result()
+                        nodes.extend(subdir for _, subdir in found)
+                        pending.update(executor.submit(node._scan, sp, ext_kind, ignore_path) for sp, node in found)
+        else:
+            while stack:
+                scan_path, node = stack.pop()
+                found = node._scan(scan_path, ext_kind, ignore_path)
+                nodes.extend(subdir for _, subdir in found)
+                stack.extend(found)
+
+        # drop directories that contain no files (children are visited before parents)
+        for node in reversed(nodes[1:]):
+            if not (node._videos or node._images or node._other_files or node._subdirs):
+                del node.parent._subdirs[node.path.name]
+                node.parent.invalidate_cache()
+        return root
+
+    def _scan(self,
+        scan_path: str,
+        ext_kind: dict[str, str],
+        ignore_path: typing.Callable[[Path],bool] | None,
+    ) -> list[tuple[str, typing.Self]]:
+        '''Populate this node from a single os.scandir call on scan_path.
+            File types come from the DirEntry (no extra stat on Linux) and extensions 
+            are classified by slicing entry.name. Returns (scan path, node) pairs for 
+            the subdirectories that still need to be scanned.
+        '''
+        subdirs = list()
+        try:
+            it = os.scandir(scan_path)
+        except OSError:
+            return subdirs
+        with it:
+            for entry in it:
+                name = entry.name
+                # joining onto self.path reuses the parent's part strings, so the 
+                # shared prefix is stored once per directory rather than per file
+                child_path = self.path / name
+                if entry.is_dir():
+                    if ignore_path is None or not ignore_path(child_path):
+                        subdir = self._subdirs[name] = self.empty(path=child_path, parent=self)
+                        subdirs.append((entry.path, subdir))
+                elif entry.is_file():
+                    i = name.rfind('.')
+                    kind = ext_kind.get(name[i+1:].lower()) if i > 0 else None
+                    if kind == 'video':
+                        self._videos[name] = VideoFile.from_path(child_path, check_exists=False)
+                    elif kind == 'image':
+                        self._images[name] = ImageFile.from_path(child_path, check_exists=False)
+                    else:
+                        self._other_files[name] = NonMediaFile.from_path(child_path, check_exists=False)
+        return subdirs
+
+    @classmethod
+    def empty(cls, path: pathlib.Path, parent: typing.Self | None = None, meta: dict | None = None) -> typing.Self:
+        '''Create a MediaDir with no files or subdirectories.'''
+        return cls(
+            path = path,
+            _videos = VideoFilesDict(),
+            _images = ImageFilesDict(),
+            _other_files = NonMediaFileDict(),
+            _subdirs = dict(),
+            parent = parent,
+            meta = meta if meta is not None else dict(),
+        )
+
     @classmethod
     def from_file_tree(
         cls, 
@@ -103,47 +205,57 @@ class MediaDir:
     ) -> typing.Self:
         '''Create a MediaDir instance from a dictionary tree representation.
         '''
-
-        videos = VideoFilesDict()
-        images = ImageFilesDict()
-        other_files = NonMediaFileDict()
-        subdirs = dict()
-        for k,v in data.items():
-            child_path = path / k
-            if isinstance(v, dict): # k represents a directory
-                if ignore_path is None or not ignore_path(child_path):
-                    subdirs[k] = cls.from_file_tree(
-                        data=v, 
-                        path=child_path,
-                        video_ext=video_ext,
-                        image_ext=image_ext, 
-                        check_exists=check_exists,
-                        ignore_path=ignore_path,
-                    )
-
-            elif v is None: # k is a file
-                ext = child_path.suffix.lower()
-                if ext in video_ext:
-                    videos[child_path.name] = VideoFile.from_path(child_path, check_exists=check_exists)
-                elif ext in image_ext:
-                    images[child_path.name] = ImageFile.from_path(child_path, check_exists=check_exists)
-                else:
-                    other_files[child_path.name] = NonMediaFile.from_path(child_path, check_exists=check_exists)
-            else:
-                raise ValueError(f'Unexpected value type in data: {v}')
-        
-        o: typing.Self = cls(
-            path = path,
-            _videos = videos,
-            _images = images,
-            _other_files = other_files,
-            _subdirs = subdirs,
-            meta = meta if meta is not None else dict(),
+        if video_ext is VIDEO_FILE_EXTENSIONS and image_ext is IMAGE_FILE_EXTENSIONS:
+            ext_kind = _EXT_KIND
+        else:
+            ext_kind = _build_ext_kind(video_ext, image_ext)
+        return cls._from_file_tree(
+            data=data,
+            path=path,
+            ext_kind=ext_kind,
+            check_exists=check_exists,
+            ignore_path=ignore_path,
+            meta=meta,
         )
-        for subdir in o.subdirs.values():
-            subdir.parent = o
 
-        return o
+    @classmethod
+    def _from_file_tree(
+        cls,
+        data: dict[str, dict|None],
+        path: pathlib.Path,
+        ext_kind: dict[str, str],
+        check_exists: bool,
+        ignore_path: typing.Callable[[Path],bool] | None,
+        meta: dict | None = None,
+    ) -> typing.Self:
+        '''Build a tree from from_file_tree data using a prebuilt extension-to-kind map.'''
+        root = cls.empty(path=path, meta=meta)
+        # the common case has no ignore function: decide once, not per directory entry
+        check_ignore = ignore_path is not None
+        stack = [(data, root)]
+        while stack:
+            node_data, node = stack.pop()
+            for k,v in node_data.items():
+                if isinstance(v, dict): # k represents a directory
+                    child_path = node.path / k
+                    if check_ignore and ignore_path(child_path):
+                        continue
+                    subdir = cls.empty(path=child_path, parent=node)
+                    node._subdirs[k] = subdir
+                    stack.append((v, subdir))
+
+                elif v is None: # k is a file
+                    i = k.rfind('.')
+                    kind = ext_kind.get(k[i+1:].lower()) if i > 0 else None
+                    if kind == 'video':
+                        node._videos[k] = VideoFile.from_path(node.path / k, check_exists=check_exists)
+                    elif kind == 'image':
+                        node._images[k] = ImageFile.from_path(node.path / k, check_exists=check_exists)
+                    else:
+                        node._other_files[k] = NonMediaFile.from_path(node.path / k, check_exists=check_exists)
+                else:
+                    raise ValueError(f'Unexpected value type in data: {v}')
+        return root
 
     def to_file_tree(self) -> dict[str, dict|None]:
         '''UNTESTED. Convert the MediaDir instance to a dictionary tree representation.
@@ -160,34 +272,116 @@ class MediaDir:
         return tree
     
     @classmethod
-    def from_dict(cls, data: dict) -> typing.Self:
+    def from_dict(cls, data: dict, parent: typing.Self | None = None) -> typing.Self:
         '''Create a MediaDir instance from a dictionary representation.
+            Files and subdirectories are parsed lazily the first time they are accessed.
         '''
-        o = cls(
-            path = pathlib.Path(data.get('path', data.get('fpath'))),  # support both for backward compatibility
-            _videos = VideoFilesDict.from_jsonable(data['videos']),
-            _images = ImageFilesDict.from_jsonable(data['images']),
-            _other_files = NonMediaFileDict.from_jsonable(data['other_files']),
-            _subdirs = {(sdf := cls.from_dict(vd)).path.name: sdf for vd in data['subdirs']},
-            meta = data['meta'],
-        )
-        for subdir in o.subdirs.values():
-            subdir.parent = o
-
+        o = cls.__new__(cls)
+        if parent is not None and 'path' not in data and 'name' in data: # compact form (see to_dict)
+            o.path = parent.path / data['name']
+        else:
+            o.path = pathlib.Path(data.get('path', data.get('fpath')))  # support both for backward compatibility
+        o.parent = parent
+        o.meta = data['meta']
+        o._cache = dict()
+        o._raw = data
         return o
+
+    def __getattr__(self, name: str) -> typing.Any:
+        '''Parse a lazy field from the dict this node was loaded from on first access.'''
+        parse = _LAZY_FIELDS.get(name)
+        if parse is not None:
+            raw = object.__getattribute__(self, '_raw')
+            if raw is not None:
+                value = parse(self, raw)
+                setattr(self, name, value)
+                return value
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+    def _is_loaded(self, name: str) -> bool:
+        '''True if a lazy field has been parsed (or was never lazy).'''
+        try:
+            object.__getattribute__(self, name)
+            return True
+        except AttributeError:
+            return False
     
-    def to_dict(self) -> dict:
+    def to_dict(self, compact: bool = False) -> dict:
         '''Convert the MediaDir instance to a dictionary representation.
+            Fields that were never parsed from a from_dict source are passed through as-is.
+        Args:
+            compact: store each directory path once; subdirectories and files are stored 
+                by name only and rebuilt from their parent in from_dict.
+        '''
+        # iterative so that deep trees do not hit the recursion limit
+        out = self._to_dict_shallow(compact, is_root=True)
+        stack = [(self, out)]
+        while stack:
+            node, d = stack.pop()
+            raw = node._raw
+            if raw is not None and not node._is_loaded('_subdirs') and _is_compact(raw) == compact:
+                d['subdirs'] = raw['subdirs']
+                continue
+            subdir_dicts = d['subdirs'] = list()
+            for subdir in node._subdirs.values():
+                sd = subdir._to_dict_shallow(compact, is_root=False)
+                subdir_dicts.append(sd)
+                stack.append((subdir, sd))
+        return out
+
+    def _to_dict_shallow(self, compact: bool, is_root: bool) -> dict:
+        '''Dictionary for this node only; 'subdirs' is filled in by to_dict.'''
+        raw = self._raw
+        passthrough = raw is not None and _is_compact(raw) == compact
+        d: dict[str, typing.Any] = {'path': str(self.path)} if (is_root or not compact) else {}
+        if compact:
+            d['name'] = self.path.name
+        for key, field in (('videos', '_videos'), ('images', '_images'), ('other_files', '_other_files')):
+            if passthrough and not self._is_loaded(field):
+                d[key] = raw[key]
+            elif compact:
+                d[key] = [{'name': name, 'meta': f.meta} for name, f in getattr(self, field).items()]
+            else:
+                d[key] = getattr(self, field).to_jsonable()
+        d['subdirs'] = None
+        d['meta'] = self.meta
+        return d
+
+    def diff(self, other: typing.Self) -> DiffResult:
+        '''Compare this MediaDir to another in a single pass over both trees.
+            Files are matched per directory by name, so each tree is walked once and 
+            only per-directory name sets are compared.
         '''
-        return {
-            'path': str(self.path),
-            'videos': self._videos.to_jsonable(),
-            'images': self._images.to_jsonable(),
-            'other_files': self._other_files.to_jsonable(),
-            'subdirs': [v.to_dict() for k,v in self.subdirs.items()],
-            'meta': self.meta,
-        }
+        this_dirs = {str(d.path): d for d in self._all_dirs()}
+        other_dirs = {str(d.path): d for d in other._all_dirs()}
+        removed: set[pathlib.Path] = set()
+        added: set[pathlib.Path] = set()
+        changed_dirs = list()
+        unchanged_count = 0
+        for key, d in this_dirs.items():
+            names = d._file_names()
+            od = other_dirs.get(key)
+            other_names = od._file_names() if od is not None else set()
+            d_removed = names - other_names
+            d_added = other_names - names
+            if d_removed or d_added:
+                changed_dirs.append(d)
+                removed.update(d.path / n for n in d_removed)
+                added.update(od.path / n for n in d_added)
+            unchanged_count += len(names) - len(d_removed)
+        for key, od in other_dirs.items():
+            if key not in this_dirs:
+                added.update(od.path / n for n in od._file_names())
+        return DiffResult(
+            removed = removed,
+            added = added,
+            changed_dirs = changed_dirs,
+            unchanged_count = unchanged_count,
+        )
 
+    def _file_names(self) -> set[str]:
+        '''Names of all files (of any type) directly in this directory.'''
+        return self._videos.keys() | self._images.keys() | self._other_files.keys()
 
     def get_changed_dirs(self,
         other: typing.Self,
@@ -195,15 +389,7 @@ class MediaDir:
         '''Compare this MediaDir to another and return a list of MediaDir instances that have changes.
         Changes include added or removed files in the directory or any of its subdirectories.
         '''
-        removed, _ = self.file_diff(other)
-        changed_rel = {fp.relative_to(self.path).parent for fp in removed}
-        result = []
-        for rel_path in changed_rel:
-            try:
-                result.append(self._subdir(rel_path))
-            except DirectoryNotFoundError:
-                pass
-        return result
+        return self.diff(other).changed_dirs
 
     def file_diff(self,
         other: typing.Self,
@@ -214,49 +400,117 @@ class MediaDir:
                 - The first set contains file paths that are present in this MediaDir but not in the other (removed files).
                 - The second set contains file paths that are present in the other MediaDir but not in this one (added files).
         '''
-        this_fps, other_fps = set(self.all_file_paths()), set(other.all_file_paths())
-        removed = this_fps - other_fps
-        added = other_fps - this_fps
-        return removed, added
-    
+        result = self.diff(other)
+        return result.removed, result.added
+
+    def hash_all_files(self, workers: int = 8, hash_algo: str = 'sha256') -> dict[pathlib.Path, str]:
+        '''Hash every file in the tree using a pool of reader threads (file hashing releases the GIL).
+            Hashing starts while the tree is still being walked; at most 2*workers files are in flight.
+        Args:
+            workers: number of hashing threads. Use ~2 for spinning disks and 8+ for SSD/NVMe.
+            hash_algo: any algorithm accepted by hashlib.new.
+        Returns:
+            dict mapping each file path to its hex digest, in tree order.
+        '''
+        return hash_files(
+            (f.path for d in self._iter_dirs_preorder() for files in (d._videos, d._images, d._other_files) for f in files.values()),
+            workers = workers,
+            hash_algo = hash_algo,
+            sort_paths = False,
+        )
+
+    ############################ Cached aggregations ############################
+    # Tree-wide aggregations are memoized on the node they were requested from.
+    # Anything that changes the tree must call invalidate_cache() on the changed node. 
+    # Mutations through the public subdirs mapping do this automatically.
+    def _cached(self, key: str, compute: typing.Callable[[], typing.Any]) -> typing.Any:
+        '''Return the cached value for key, computing and storing it on a miss.'''
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = compute()
+            return value
+
+    def invalidate_cache(self) -> None:
+        '''Clear cached aggregations (all_* results) on this directory and every parent. 
+            Call after changing a directory's files in place.
+        '''
+        self._cache.clear()
+        for parent in self.parents():
+            parent._cache.clear()
+
+    def _iter_dirs_preorder(self) -> typing.Iterator[typing.Self]:
+        '''Iterate over this directory and all subdirectories, parents first.'''
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node._subdirs.values())) # keep insertion order among siblings
+
+    def _all_dirs(self) -> list[typing.Self]:
+        return self._cached('all_dirs', lambda: list(self._iter_dirs_preorder()))
+
+    def _all_video_files(self) -> list[VideoFile]:
+        return self._cached('all_videos', lambda: _concat_values(d._videos for d in self._all_dirs()))
+
+    def _all_image_files(self) -> list[ImageFile]:
+        return self._cached('all_images', lambda: _concat_values(d._images for d in self._all_dirs()))
+
+    def _all_file_paths(self) -> list[pathlib.Path]:
+        def compute() -> list[pathlib.Path]:
+            paths = list()
+            for d in self._all_dirs():
+                paths.extend(vf.path for vf in d._videos.values())
+                paths.extend(imf.path for imf in d._images.values())
+                paths.extend(of.path for of in d._other_files.values())
+            return paths
+        return self._cached('all_file_paths', compute)
+
+    def _all_media_paths(self) -> list[pathlib.Path]:
+        def compute() -> list[pathlib.Path]:
+            paths = list()
+            for d in self._all_dirs():
+                paths.extend(vf.path for vf in d._videos.values())
+                paths.extend(imf.path for imf in d._images.values())
+            return paths
+        return self._cached('all_media_paths', compute)
+
+    # public methods return copies so callers cannot corrupt the cache
     def all_file_paths(self) -> list[pathlib.Path]:
         '''Get a list of all files in the directory, including subdirectories.
         '''
-        paths = self.video_paths() + self.image_paths() + [of.path for of in self.other_files]
-        for subdir in self.subdirs.values():
-            paths.extend(subdir.all_file_paths())
-        return paths
+        return list(self._all_file_paths())
     
     def all_media_paths(self) -> list[pathlib.Path]:
         '''Get a list of all media files in the directory, including subdirectories.
         '''
-        files = self.video_paths() + self.image_paths()
-        for subdir in self.subdirs.values():
-            files.extend(subdir.all_media_paths())
-        return files
+        return list(self._all_media_paths())
     
     def all_video_paths(self) -> list[pathlib.Path]:
         '''Get the paths of all video files.'''
-        return [vf.path for vf in self.all_video_files()]
+        return [vf.path for vf in self._all_video_files()]
     
     def all_image_paths(self) -> list[pathlib.Path]:
         '''Get the paths of all image files.'''
-        return [ifp.path for ifp in self.all_image_files()]
+        return [ifp.path for ifp in self._all_image_files()]
 
     def all_dirs(self) -> list[typing.Self]:
         '''Get a list of all directories in the tree, including subdirectories.
         '''
-        dirs = [self]
-        for subdir in self.subdirs.values():
-            dirs.extend(subdir.all_dirs())
-        return dirs
+        return list(self._all_dirs())
     
     def all_dirs_iter(self) -> typing.Generator[typing.Self]:
-        '''Get a list of all directories in the tree, including subdirectories.
+        '''Iterate over all directories in the tree, children before their parents.
         '''
-        for subdir in self.subdirs.values():
-            yield from subdir.all_dirs_iter()
-        yield self
+        # explicit stack: no generator frame per level and no recursion limit
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            else:
+                stack.append((node, True))
+                stack.extend((sd, False) for sd in reversed(node._subdirs.values()))
 
     def all_videos(self) -> VideoFiles:
         '''DEPRICATED. Use all_video_files() instead. Get a list of all video files in the directory, including subdirectories.
@@ -266,10 +520,7 @@ class MediaDir:
     def all_video_files(self) -> VideoFiles:
         '''Get a list of all video files in the directory, including subdirectories.
         '''
-        videos = self._videos.to_list()
-        for subdir in self.subdirs.values():
-            videos.extend(subdir.all_video_files())
-        return VideoFiles(videos)
+        return VideoFiles(self._all_video_files())
     
     def all_images(self) -> ImageFiles:
         '''DEPRICATED. Use all_image_files() instead. Get a list of all image files in the directory, including subdirectories.
@@ -279,10 +530,7 @@ class MediaDir:
     def all_image_files(self) -> ImageFiles:
         '''Get a list of all image files in the directory, including subdirectories.
         '''
-        images = self._images.to_list()
-        for subdir in self.subdirs.values():
-            images.extend(subdir.all_image_files())
-        return ImageFiles(images)
+        return ImageFiles(self._all_image_files())
     
     def video_paths(self) -> list[pathlib.Path]:
         '''Get the paths of video files in this directory.'''
@@ -309,8 +557,13 @@ class MediaDir:
     
     @property
     def subdirs(self) -> dict[str, typing.Self]:
-        '''Get the subdirectories in this directory.'''
-        return self._subdirs
+        '''Get the subdirectories in this directory. Adding or removing entries 
+            invalidates the cached aggregations of this directory and its parents.
+        '''
+        subdirs = self._subdirs
+        if type(subdirs) is not _SubdirsDict:
+            subdirs = self._subdirs = _SubdirsDict(self, subdirs)
+        return subdirs
     
     def get_nonmedia(self, path: Path) -> NonMediaFile:
         '''Get a non-media file by filename.'''
@@ -452,6 +705,20 @@ class MediaDir:
         return f'{self.__class__.__name__}("{self.path}")'
 
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class DiffResult:
+    '''Result of MediaDir.diff.
+    Attributes:
+        removed: paths of files in the first tree but not the second.
+        added: paths of files in the second tree but not the first.
+        changed_dirs: directories of the first tree that lost or gained files.
+        unchanged_count: number of files present in both trees.
+    '''
+    removed: set[pathlib.Path]
+    added: set[pathlib.Path]
+    changed_dirs: list[MediaDir]
+    unchanged_count: int
+
 class ImageNotFoundError(Exception):
     '''Raised when an image file is not found in a MediaDir.'''
     pass
@@ -492,3 +759,77 @@ class NonMediaFileDict(dict[Path, NonMediaFile]):
         '''Create NonMediaFileDict from NonMediaFile list.'''
         return cls({nmf.path: nmf for nmf in non_media_files})
 
+
+class _SubdirsDict(dict[str, MediaDir]):
+    '''Subdirectory mapping that clears its owner's cached aggregations on mutation.'''
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: MediaDir, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = owner
+
+    def __reduce__(self):
+        return (self.__class__, (self._owner, dict(self)))
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._owner.invalidate_cache()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._owner.invalidate_cache()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._owner.invalidate_cache()
+        return self
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._owner.invalidate_cache()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._owner.invalidate_cache()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._owner.invalidate_cache()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._owner.invalidate_cache()
+
+    def clear(self):
+        super().clear()
+        self._owner.invalidate_cache()
+
+
+def _parse_subdirs(mdir: MediaDir, raw: dict) -> dict[str, MediaDir]:
+    subdirs = dict()
+    for vd in raw['subdirs']:
+        sd = MediaDir.from_dict(vd, parent=mdir)
+        subdirs[sd.path.name] = sd
+    return subdirs
+
+def _is_compact(raw: dict) -> bool:
+    '''Whether a serialized directory uses the compact (names only) form of to_dict.'''
+    return 'name' in raw
+
+def _files_parser(key: str, dict_type: type, file_type: type) -> typing.Callable[[MediaDir, dict], typing.Any]:
+    def parse(mdir: MediaDir, raw: dict) -> typing.Any:
+        if not _is_compact(raw):
+            return dict_type.from_jsonable(raw[key])
+        return dict_type({e['name']: file_type(path=mdir.path / e['name'], meta=e['meta']) for e in raw[key]})
+    return parse
+
+# fields of a MediaDir loaded with from_dict that are parsed on first access
+_LAZY_FIELDS: dict[str, typing.Callable[[MediaDir, dict], typing.Any]] = {
+    '_videos': _files_parser('videos', VideoFilesDict, VideoFile),
+    '_images': _files_parser('images', ImageFilesDict, ImageFile),
+    '_other_files': _files_parser('other_files', NonMediaFileDict, NonMediaFile),
+    '_subdirs': _parse_subdirs,
+}
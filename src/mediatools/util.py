@@ -1,16 +1,31 @@
 import multiprocessing
+import array
+import dataclasses
+import sys
 import typing
 from pathlib import Path
 import functools
 import pathlib
 import hashlib
+import mmap
 from collections import defaultdict
+import collections
+import concurrent.futures
 import urllib.parse
 import glob
+import fnmatch
 import os
+import re
+import sqlite3
+import contextlib
 
 import tqdm
 
+try:
+    import blake3 # type: ignore
+except ImportError:
+    blake3 = None
+
 Constant = str | int | bool | float
 T = typing.TypeVar('T')
 R = typing.TypeVar('R')
@@ -44,22 +59,186 @@ def get_hash_firstmb_hex(vid_path_abs: Path) -> str:
 
 def get_hash_hex(file_path: Path, chunk_size: int = 1024, max_chunks: int|None = None) -> str:
     '''Creates a SHA256 hash from the file. Only uses up to max_chunks of chunk_size bytes.'''
-    sha256_hash = hashlib.sha256()
-    with Path(file_path).open("rb") as f:
-        for i, byte_block in enumerate(iter(lambda: f.read(chunk_size), b"")):
-            if max_chunks is not None and i >= max_chunks:
-                break
-            sha256_hash.update(byte_block)
-    return sha256_hash.hexdigest()
-
-def hash_file(path, hash_algo='sha256') -> str:
-    """Generate a hash for a file using the specified hash algorithm."""
-    hasher = hashlib.new(hash_algo)
-    with open(path, 'rb') as f:
-        for chunk in iter(lambda: f.read(8192), b''):
-            hasher.update(chunk)
+    with open(file_path, 'rb') as f:
+        if max_chunks is None:
+            return hashlib.file_digest(f, _HASH_CTORS['sha256']).hexdigest()
+        # the prefix is small, so read it in one call instead of a python loop over chunks
+        return _HASH_CTORS['sha256'](f.read(chunk_size*max_chunks)).hexdigest()
+
+# direct constructors skip the name lookup in hashlib.new. These digests identify files 
+# rather than protect secrets, so they are marked usedforsecurity=False (matters on FIPS builds).
+# shake_* digests need an explicit length, so hash_file cannot use them.
+_HASH_CTORS = {
+    name: functools.partial(getattr(hashlib, name), usedforsecurity=False)
+    for name in sorted(hashlib.algorithms_guaranteed) if not name.startswith('shake_')
+}
+
+_HASH_BUFSIZE = 1 << 18
+_HASH_MMAP_MIN_SIZE = 16 << 20
+_HASH_MMAP_SLICE = 64 << 20
+
+def hash_file(path, hash_algo='sha256', buffer_size: int | None = None) -> str:
+    """Generate a hash for a file using the specified hash algorithm.
+        Files are read with readinto into one reused buffer and hashed by OpenSSL (which 
+        uses SHA extensions where the CPU has them and releases the GIL while hashing). 
+        Files smaller than one buffer are read and hashed in a single call, which 
+        dominates when hashing many small files. Files of 16 MiB or more are memory 
+        mapped and hashed from the page cache without copying.
+    Args:
+        hash_algo: any algorithm accepted by hashlib.new, or 'blake3' (needs the optional 
+            blake3 package). Prefer blake3 for content indexing and deduplication, where it 
+            is several times faster than sha256; keep sha256 where digests are compared 
+            against published checksums.
+        buffer_size: read block size, 256 KiB by default. Larger blocks (e.g. 1 << 22) 
+            can help on network filesystems with high per-read latency. Passing it 
+            also disables memory mapping.
+    """
+    if hash_algo == 'blake3':
+        return _hash_blake3(path)
+    ctor = _HASH_CTORS.get(hash_algo) or functools.partial(hashlib.new, hash_algo)
+    use_mmap = buffer_size is None
+    buffer_size = buffer_size or _HASH_BUFSIZE
+    with open(path, 'rb', buffering=0) as f:
+        head = f.read(buffer_size)
+        hasher = ctor(head)
+        size = os.fstat(f.fileno()).st_size
+        if len(head) < buffer_size and len(head) == size: # a short read is not EOF unless the size agrees
+            return hasher.hexdigest()
+
+        if use_mmap and size >= _HASH_MMAP_MIN_SIZE:
+            _hash_mmap(f, hasher, offset=len(head))
+            return hasher.hexdigest()
+
+        _advise_sequential(f)
+        buf = bytearray(buffer_size) # reused for every read, so no bytes object per block
+        view = memoryview(buf)
+        read, update = f.readinto, hasher.update # bound once, not per block
+        while n := read(buf):
+            update(view[:n])
     return hasher.hexdigest()
 
+def _hash_blake3(path) -> str:
+    '''BLAKE3 digest. The blake3 package maps the file itself and hashes it with SIMD 
+        across all cores, so there is no python read loop.
+    '''
+    if blake3 is None:
+        raise ImportError("hash_algo='blake3' requires the blake3 package: pip install mediatools[fasthash]")
+    return blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(path).hexdigest()
+
+def _hash_mmap(f: typing.BinaryIO, hasher, offset: int) -> None:
+    '''Hash the file from offset to the end straight out of the page cache. Slices keep 
+        each update call bounded. The file must not be truncated while it is mapped.
+    '''
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, 'madvise'):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        with memoryview(mm) as view:
+            for start in range(offset, len(mm), _HASH_MMAP_SLICE):
+                hasher.update(view[start:start+_HASH_MMAP_SLICE])
+
+def _advise_sequential(f: typing.BinaryIO) -> None:
+    '''Tell the kernel the whole file will be read in order so it uses a larger readahead 
+        window and keeps reads in flight while the previous block is hashed. No-op where 
+        posix_fadvise is unavailable.
+    '''
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass
+
+def hash_files(
+    paths: typing.Iterable[str | Path], 
+    workers: int | None = None, 
+    hash_algo: str = 'sha256',
+    sort_paths: bool = True,
+) -> dict[Path, str]:
+    """Hash many files with a pool of threads (hashlib releases the GIL while hashing).
+        Paths are consumed lazily and at most 2*workers files are in flight.
+    Args:
+        paths: files to hash.
+        workers: number of hashing threads, defaults to the cpu count. Use ~2-4 for 
+            spinning disks, where more concurrent readers cause seeking.
+        hash_algo: any algorithm accepted by hash_file, including 'blake3'.
+        sort_paths: hash in sorted path order so files in the same directory are 
+            read one after another. Set False to keep the input order (paths are then 
+            not materialized up front).
+    Returns:
+        dict mapping each path to its hex digest, in the order files were submitted.
+    """
+    workers = workers or os.cpu_count() or 1
+    if sort_paths:
+        paths = sorted(Path(p) for p in paths)
+    hashes: dict[Path, str] = dict()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: collections.deque[tuple[Path, concurrent.futures.Future[str]]] = collections.deque()
+        for p in paths:
+            pending.append((Path(p), executor.submit(hash_file, p, hash_algo)))
+            if len(pending) >= 2*workers:
+                fp, fut = pending.popleft()
+                hashes[fp] = fut.result()
+        while pending:
+            fp, fut = pending.popleft()
+            hashes[fp] = fut.result()
+    return hashes
+
+
+_HASH_CACHE_PATH = Path('~/.cache/mediatools_hash.sqlite')
+
+def hash_file_cached(path: str | Path, hash_algo: str = 'sha256', cache_path: str | Path | None = None) -> str:
+    """hash_file that skips files whose (device, inode, mtime, size) match the on-disk cache."""
+    return hash_files_cached([path], hash_algo=hash_algo, cache_path=cache_path)[Path(path)]
+
+def hash_files_cached(
+    paths: typing.Iterable[str | Path], 
+    workers: int | None = None, 
+    hash_algo: str = 'sha256',
+    cache_path: str | Path | None = None,
+) -> dict[Path, str]:
+    """hash_files for repeated scans: unchanged files cost one stat instead of a full read.
+        Digests are stored in a sqlite database keyed by (device, inode, algorithm) along 
+        with the mtime_ns and size they were computed for. Misses are hashed with 
+        hash_files and written back in one transaction.
+    Args:
+        cache_path: sqlite file to use, defaults to ~/.cache/mediatools_hash.sqlite.
+    Returns:
+        dict mapping each path to its hex digest, in input order.
+    """
+    stats = {Path(p): os.stat(p) for p in paths}
+    hashes: dict[Path, str] = dict()
+    misses: list[Path] = list()
+    with contextlib.closing(_open_hash_cache(cache_path)) as con:
+        for p, st in stats.items():
+            row = con.execute(
+                'SELECT mtime_ns, size, digest FROM hashes WHERE dev=? AND ino=? AND algo=?',
+                (st.st_dev, st.st_ino, hash_algo),
+            ).fetchone()
+            if row is not None and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                hashes[p] = row[2]
+            else:
+                misses.append(p)
+
+        if misses:
+            hashes.update(hash_files(misses, workers=workers, hash_algo=hash_algo))
+            with con: # one commit for all new digests
+                con.executemany('INSERT OR REPLACE INTO hashes VALUES (?,?,?,?,?,?)', [
+                    (stats[p].st_dev, stats[p].st_ino, hash_algo, stats[p].st_mtime_ns, stats[p].st_size, hashes[p]) 
+                    for p in misses
+                ])
+    return {p: hashes[p] for p in stats}
+
+def _open_hash_cache(cache_path: str | Path | None) -> sqlite3.Connection:
+    path = Path(cache_path or _HASH_CACHE_PATH).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    con = sqlite3.connect(path)
+    con.execute('PRAGMA journal_mode=WAL')
+    con.execute('PRAGMA synchronous=NORMAL') # WAL keeps the db consistent, a crash can only lose recent digests
+    con.execute(
+        'CREATE TABLE IF NOT EXISTS hashes ('
+        'dev INTEGER, ino INTEGER, algo TEXT, mtime_ns INTEGER, size INTEGER, digest TEXT NOT NULL, '
+        'PRIMARY KEY (dev, ino, algo)) WITHOUT ROWID'
+    )
+    return con
 
 
 ########################### Old factories for type hints ###########################
@@ -78,32 +257,91 @@ class VideoTime(str):
     '''Represents a time value in video. Retain as string for perfect storage.'''
     
     def as_float(self) -> float:
+        return self._float
+
+    @functools.cached_property
+    def _float(self) -> float:
+        '''Parsed on first use; the string stays the canonical value.'''
         return float(self)
 
 ################# File extension utilities ################
 
 def multi_extension_glob(
-    glob_func: typing.Callable[[str],list[Path]], 
+    path: str | Path, 
     extensions: typing.Iterable[str],
     base_name_pattern: str = '*',
+    recursive: bool = False,
 ) -> list[Path]:
-    '''Get a list of file paths that match patterns for different file extensions.
+    '''Get a sorted list of file paths in a directory that match any of the extensions.
+        Reads the directory once instead of globbing once per extension.
     Args:
-        glob_func: A function that takes a pattern and returns a list of paths.
-            Could be glob.glob, Path.glob, or Path.rglob.
-        extensions: A list of file extensions to search for.
+        path: directory to search.
+        extensions: file extensions to search for, with or without leading dot.
+            Matching is case-insensitive.
         base_name_pattern: The base name pattern to use for the file name.
-            Example: "*" or "video_*" or "vid_*_name". Concatenated with extensions.
+            Example: "*" or "video_*" or "vid_*_name". Matched against the name without extension.
+        recursive: search subdirectories as well (like rglob).
+    '''
+    return single_pass_multi_ext_rglob(path, extensions, base_name_pattern, recursive)
+    
+
+def single_pass_multi_ext_rglob(
+    root: str | Path,
+    extensions: typing.Iterable[str],
+    base_name_pattern: str = '*',
+    recursive: bool = True,
+) -> list[Path]:
+    '''Get sorted file paths matching any of the extensions using a single scandir walk.
+        Extension matching is case-insensitive.
+    Args:
+        root: directory to search.
+        extensions: file extensions to search for, with or without leading dot.
+        base_name_pattern: fnmatch pattern applied to the file name without extension.
+        recursive: descend into subdirectories (like rglob) or not (like glob).
     '''
-    # insert capitalized and lower case versions of extensions
-    exts = list(extensions)
-    extensions = [e.lower() for e in exts] + [e.upper() for e in exts]
-
-    all_paths = set()
-    for ext in extensions:
-        pattern = f'{base_name_pattern}{ext}' if ext.startswith('.') else f'{base_name_pattern}.{ext}'
-        all_paths.update(glob_func(pattern))
-    return list(sorted(all_paths))
+    # sort the strings split into components (same order as sorting Paths, which compare
+    # part by part) and only then build the Path objects
+    paths = [entry.path for entry in iter_multi_ext_entries(root, extensions, base_name_pattern, recursive)]
+    paths.sort(key=_path_sort_key)
+    return [Path(p) for p in paths]
+
+def _path_sort_key(path: str) -> list[str]:
+    return path.split(os.sep)
+
+@functools.lru_cache(maxsize=64)
+def _normalized_ext_set(extensions: tuple[str, ...] | frozenset[str]) -> frozenset[str]:
+    '''Lower-cased extensions without leading dots. Cached since the same few extension 
+        collections are passed for every directory that is scanned.
+    '''
+    return frozenset(e.lower().lstrip('.') for e in extensions)
+
+def iter_multi_ext_entries(
+    root: str | Path,
+    extensions: typing.Iterable[str],
+    base_name_pattern: str = '*',
+    recursive: bool = True,
+) -> typing.Iterator[os.DirEntry]:
+    '''Iterate over DirEntry objects matching any of the extensions (unsorted). 
+        See single_pass_multi_ext_rglob for arguments.
+    '''
+    ext_set = _normalized_ext_set(extensions if isinstance(extensions, (tuple, frozenset)) else tuple(extensions))
+    match_all = base_name_pattern == '*'
+
+    stack = [str(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                    continue
+                stem, dot, ext = entry.name.rpartition('.')
+                if dot and ext.lower() in ext_set and (match_all or fnmatch.fnmatchcase(stem, base_name_pattern)):
+                    yield entry
     
 
 ################ Print formatting utilities ################
@@ -129,7 +367,7 @@ def format_memory(num_bytes: int, decimals: int = 2):
     elif num_bytes >= 1e6:
         return f'{num_bytes/1e6:0.{decimals}f} MB'
     elif num_bytes >= 1e3:
-        return f'{num_bytes*1e3:0.{decimals}f} kB'
+        return f'{num_bytes/1e3:0.{decimals}f} kB'
     else:
         return f'{num_bytes:0.{decimals}f} Bytes'
 
@@ -142,7 +380,7 @@ def format_memory(num_bytes: int, decimals: int = 2):
 
 ################ File tree utilities ################
 
-def build_file_tree(root: pathlib.Path, pattern: str = '*') -> defaultdict:
+def build_file_tree(root: pathlib.Path, pattern: str = '*') -> dict:
     """Build a tree structure from file paths in a directory.
     
         # Example usage
@@ -154,13 +392,31 @@ def build_file_tree(root: pathlib.Path, pattern: str = '*') -> defaultdict:
 
     """
     root = pathlib.Path(root)
-    #glob_result = root.rglob(pattern)
-    #glob_result = [pathlib.Path(fn) for fn in glob.glob(str(root / '**' / pattern), recursive=True)]
-    glob_result = get_all_files(root)
-    file_paths = [fp.relative_to(root) for fp in glob_result if fp.is_file()]
-    tree = make_tree()
-    for path in file_paths:
-        insert_path(tree, path)
+    tree = {}
+    # iterative scandir walk: DirEntry answers is_dir/is_file from the readdir
+    # result, so no extra stat per entry. Directories without files are pruned
+    # afterwards to match the previous glob-based behavior. Nodes are plain dicts
+    # since every child is created explicitly.
+    added_dirs: list[tuple[dict, str]] = []
+    stack: list[tuple[str, dict]] = [(str(root), tree)]
+    while stack:
+        dirpath, node = stack.pop()
+        try:
+            it = os.scandir(dirpath)
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    subtree = node[entry.name] = {}
+                    added_dirs.append((node, entry.name))
+                    stack.append((entry.path, subtree))
+                elif entry.is_file():
+                    node[entry.name] = None
+
+    for node, name in reversed(added_dirs):
+        if not node[name]:
+            del node[name]
     return tree
 
 def make_tree():
@@ -168,24 +424,134 @@ def make_tree():
     return defaultdict(make_tree)
 
 # Insert a path into the tree
-def insert_path(tree: defaultdict, path: pathlib.Path):
+def insert_path(tree: dict, path: pathlib.Path):
     """Insert a file path into the tree structure."""
     parts = path.parts
     for part in parts[:-1]:  # all directories
-        # Only traverse if not a file node
-        if tree.get(part) is None:
-            tree[part] = make_tree()
-        tree = tree[part]
-    # Only set file node if not already present
-    if tree.get(parts[-1]) is None or isinstance(tree.get(parts[-1]), dict):
-        tree[parts[-1]] = None  # file
+        subtree = tree.get(part)
+        if subtree is None: # missing, or a file node that becomes a directory
+            subtree = tree[part] = {}
+        tree = subtree
+    # nodes are either None (file) or a dict, and both cases were always overwritten
+    tree[parts[-1]] = None  # file
+
+_INDENTS = ['  ' * i for i in range(64)]
+_TREE_FLUSH_LINES = 4096
+
+def _indent(depth: int) -> str:
+    return _INDENTS[depth] if depth < len(_INDENTS) else '  ' * depth
 
 def print_tree(d: dict, indent=0):
-    """Recursively print the tree structure."""
-    for key, value in d.items():
-        print("  " * indent + str(key))
-        if isinstance(value, dict):
-            print_tree(value, indent + 1)
+    """Print the tree structure, one indented line per node."""
+    # explicit stack instead of recursion so deep trees cannot hit the recursion limit. 
+    # Lines are collected and written in batches rather than one print per node.
+    write = sys.stdout.write
+    lines: list[str] = []
+    stack = [(iter(d.items()), indent)]
+    while stack:
+        items, depth = stack[-1]
+        for key, value in items:
+            lines.append(f'{_indent(depth)}{key}\n')
+            if len(lines) >= _TREE_FLUSH_LINES:
+                write(''.join(lines))
+                lines.clear()
+            if value is not None: # files are None, directories are dicts
+                stack.append((iter(value.items()), depth + 1))
+                break
+        else:
+            stack.pop()
+    write(''.join(lines))
+
+
+@dataclasses.dataclass
+class FileTree:
+    """Flat (struct-of-arrays) file tree: node i is named names[i], has parent 
+        parents[i] (-1 for the root at index 0), and is a file if is_file[i].
+        Much smaller than nested dicts for trees with millions of files.
+    """
+    names: list[str] = dataclasses.field(default_factory=list)
+    parents: array.array = dataclasses.field(default_factory=lambda: array.array('i'))
+    is_file: array.array = dataclasses.field(default_factory=lambda: array.array('b'))
+
+    @classmethod
+    def from_path(cls, root: pathlib.Path|str) -> typing.Self:
+        """Scan root into a flat tree. Directories without files are pruned, as in build_file_tree."""
+        names, parents, is_file = [str(root)], array.array('i', [-1]), array.array('b', [0])
+        stack = [(str(root), 0)]
+        while stack:
+            dirpath, parent = stack.pop()
+            try:
+                it = os.scandir(dirpath)
+            except OSError:
+                continue
+            with it:
+                for entry in it:
+                    if entry.is_dir():
+                        stack.append((entry.path, len(names)))
+                        flag = 0
+                    elif entry.is_file():
+                        flag = 1
+                    else:
+                        continue
+                    names.append(entry.name)
+                    parents.append(parent)
+                    is_file.append(flag)
+        return cls(names, parents, is_file)._pruned()
+
+    def _pruned(self) -> typing.Self:
+        """Drop directories without any file below them. Parents always precede children."""
+        keep = bytearray(self.is_file)
+        keep[0] = 1
+        for i in range(len(self.names) - 1, 0, -1):
+            if keep[i]:
+                keep[self.parents[i]] = 1
+        if all(keep):
+            return self
+        new_index = array.array('i', [-1]) * len(self.names)
+        tree = self.__class__()
+        for i, k in enumerate(keep):
+            if k:
+                new_index[i] = len(tree.names)
+                tree.names.append(self.names[i])
+                tree.parents.append(new_index[self.parents[i]] if i else -1)
+                tree.is_file.append(self.is_file[i])
+        return tree
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @functools.cached_property
+    def children(self) -> dict[int, list[int]]:
+        """Child indices of each directory node, built on first access."""
+        children = {i: [] for i, f in enumerate(self.is_file) if not f}
+        for i in range(1, len(self.names)):
+            children[self.parents[i]].append(i)
+        return children
+
+    def to_dict(self) -> dict:
+        """Nested dict form matching build_file_tree (files map to None)."""
+        nodes = [None] * len(self.names)
+        nodes[0] = {}
+        for i in range(1, len(self.names)):
+            nodes[i] = None if self.is_file[i] else {}
+            nodes[self.parents[i]][self.names[i]] = nodes[i]
+        return nodes[0]
+
+    def print_tree(self, indent: int = 0):
+        """Print the tree below the root, one indented line per node."""
+        children, names, is_file = self.children, self.names, self.is_file
+        write = sys.stdout.write
+        lines: list[str] = []
+        stack = [(i, indent) for i in reversed(children[0])]
+        while stack:
+            i, depth = stack.pop()
+            lines.append(f'{_indent(depth)}{names[i]}\n')
+            if len(lines) >= _TREE_FLUSH_LINES:
+                write(''.join(lines))
+                lines.clear()
+            if not is_file[i]:
+                stack.extend((c, depth + 1) for c in reversed(children[i]))
+        write(''.join(lines))
 
 
 
@@ -193,43 +559,74 @@ def print_tree(d: dict, indent=0):
 def get_all_files(root: pathlib.Path|str) -> list[pathlib.Path]:
     all_files = []
     for dirpath, dirnames, filenames in os.walk(str(root), followlinks=True):
-        for fn in filenames:
-            fpath = pathlib.Path(dirpath) / fn
-            all_files.append(fpath)
+        base = pathlib.Path(dirpath) # parsed once per directory rather than once per file
+        all_files.extend(base / fn for fn in filenames)
     return all_files
 
+_TITLE_TRANS = str.maketrans('_-', '  ')
+_WS_RE = re.compile(r'\s+') # same whitespace set as str.split()
+
+# memoized since the same names are formatted again for every page render
+@functools.lru_cache(maxsize=4096)
 def fname_to_title(fname: str, max_char: int = 150) -> str:
-    replaced = fname.replace('_', ' ').replace('-', ' ')
-    return ' '.join(replaced.strip().split()).title()[:max_char]
+    return _titleize(fname, max_char)
+
+def _titleize(fname: str, max_char: int) -> str:
+    return _WS_RE.sub(' ', fname.translate(_TITLE_TRANS).strip()).title()[:max_char]
 
+@functools.lru_cache(maxsize=4096)
 def fname_to_id(fname: str) -> str:
-    return '-'.join(fname.strip().split())
+    return _WS_RE.sub('-', fname.strip())
 
 def parse_url(urlstr: str) -> str:
     try:
-        return urllib.parse.quote(urlstr)
-    except TypeError as e:
+        return _quote_cached(urlstr)
+    except TypeError as e: # also raised by the cache for unhashable input
         return ''
 
+@functools.lru_cache(maxsize=8192)
+def _quote_cached(urlstr: str) -> str:
+    '''Media paths are quoted again for every render that links to them.'''
+    return urllib.parse.quote(urlstr)
+
+def titleize_bulk(names: typing.Iterable[str], max_char: int = 150) -> list[str]:
+    '''fname_to_title over many names, without per-call cache lookups.'''
+    return [_titleize(n, max_char) for n in names]
+
 
 
 
 ############### parallelization utilities ################
 
+def get_mp_context(context: str | None = None) -> multiprocessing.context.BaseContext:
+    '''Get multiprocessing context. Defaults to fork on Linux and spawn elsewhere.'''
+    if context is None:
+        context = 'fork' if sys.platform.startswith('linux') else 'spawn'
+    return multiprocessing.get_context(context)
+
 def parallel_map(
     func: typing.Callable[[T], R], 
     elements: list[T], 
     num_processes: int = 1, 
     use_tqdm: bool = False,
-    ncols: int = 120
+    ncols: int = 120,
+    context: str | None = None,
+    initializer: typing.Callable[..., None] | None = None,
+    initargs: tuple[typing.Any, ...] = (),
 ) -> list[R]:
-    '''Map function in parallel using multiprocessing.'''
+    '''Map function in parallel using multiprocessing.
+        Uses fork on Linux so workers inherit state set up by initializer 
+        via copy-on-write instead of pickling it per task. With one process, 
+        initializer runs once in the calling process.
+    '''
     if use_tqdm:
         elements = tqdm.tqdm(elements, total=len(elements), desc=str(func), ncols=ncols)
     if num_processes == 1:
+        if initializer is not None:
+            initializer(*initargs)
         return list(map(func, elements))
     else:
-        with multiprocessing.Pool(num_processes) as pool:
+        with get_mp_context(context).Pool(num_processes, initializer, initargs) as pool:
             return list(pool.map(func, elements))
         
 def parallel_starmap(
@@ -237,12 +634,21 @@ def parallel_starmap(
     elements: list[tuple[typing.Any, ...]], 
     num_processes: int = 1, 
     use_tqdm: bool = False,
+    context: str | None = None,
+    initializer: typing.Callable[..., None] | None = None,
+    initargs: tuple[typing.Any, ...] = (),
 ) -> list[R]:
-    '''Map function in parallel using multiprocessing.'''
+    '''Map function in parallel using multiprocessing.
+        Uses fork on Linux so workers inherit state set up by initializer 
+        via copy-on-write instead of pickling it per task. With one process, 
+        initializer runs once in the calling process.
+    '''
     if use_tqdm:
         elements = tqdm.tqdm(elements, total=len(elements))
     if num_processes == 1:
+        if initializer is not None:
+            initializer(*initargs)
         return [func(*e) for e in elements]
     else:
-        with multiprocessing.Pool(num_processes) as pool:
+        with get_mp_context(context).Pool(num_processes, initializer, initargs) as pool:
             return list(pool.starmap(func, elements))
\ No newline at end of file
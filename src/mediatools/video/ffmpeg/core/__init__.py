@@ -9,7 +9,11 @@ from .command import (
     ffoutput,
     FFOutputArgs,
     LOGLEVEL_OPTIONS,
+    HWAccelConfig,
     run_ffmpeg_subprocess,
+    run_ffmpeg_subprocess_async,
+    arun_many,
+    ffmpeg_many,
 )
 from .filters import (
     filtergraph_link,
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import collections
 import dataclasses
+import functools
 import subprocess
 import typing
 import shlex
+import threading
+import os
 from pathlib import Path
 
 from .errors import (
@@ -42,6 +47,13 @@ class FFMPEG:
         hide_banner: Whether to hide the FFmpeg banner (default: True).
         nostats: Whether to disable statistics output (default: True).
         progress: File path for writing progress reports.
+        progress_callback: Called with a dict of ffmpeg's key=value progress fields 
+            (out_time, fps, speed, progress, ...) for each report while the command runs. 
+            Reports arrive over a pipe (POSIX only). The callback runs on a background 
+            daemon thread, not the calling thread or event loop, so it must be thread-safe 
+            (e.g. schedule UI updates with loop.call_soon_threadsafe). If it raises, the 
+            exception is re-raised by run/arun once ffmpeg exits. Cannot be combined with 
+            progress.
         other_args: Additional command arguments as (name, value) tuples.
         other_flags: Additional command flags as strings.
     
@@ -53,6 +65,17 @@ class FFMPEG:
             ... )
             >>> result = cmd.run()
         
+        Encode several renditions from one decode of the input (preferred over one 
+        command per rendition, which decodes the source again each time):
+            >>> cmd = FFMPEG(
+            ...     inputs=[ffinput("input.mp4")],
+            ...     outputs=[
+            ...         ffoutput(f"out_{h}p.mp4", v_f=f"scale=-2:{h}", c_v="libx264", crf=23, y=True)
+            ...         for h in (360, 720, 1080)
+            ...     ]
+            ... )
+            >>> result = cmd.run()
+        
         Extract a video clip:
             >>> cmd = FFMPEG(
             ...     inputs=[ffinput("movie.mp4", ss="00:01:30", t="00:00:10")],
@@ -117,6 +140,14 @@ class FFMPEG:
             ...     outputs=[ffoutput("output.mp4", c_v="h264_nvenc", preset="fast", y=True)]
             ... )
             >>> result = cmd.run()
+        
+        Keep decoded frames on the GPU through to the encoder:
+            >>> hw = HWAccelConfig("cuda", output_format="cuda")
+            >>> cmd = FFMPEG(
+            ...     inputs=[ffinput("input.mp4", hw=hw)],
+            ...     outputs=[ffoutput("output.mp4", c_v=hw.encoder("h264"), y=True)]
+            ... )
+            >>> result = cmd.run()
     
     Returns:
         FFMPEGResult: Container with the executed command, subprocess result, and convenience properties.
@@ -136,12 +167,15 @@ class FFMPEG:
     hide_banner: bool = dataclasses.field(default=True, metadata={"flag": "hide_banner", 'desc': 'Hide banner'})
     nostats: bool = dataclasses.field(default=True, metadata={"flag": "nostats", 'desc': 'Disable stats'})
     progress: str|None = dataclasses.field(default=None, metadata={"arg": "progress", 'desc': 'Write progress report to file'})
+    progress_callback: typing.Callable[[dict[str,str]], None]|None = dataclasses.field(default=None, repr=False, compare=False, metadata={'desc': 'Receives parsed progress reports'})
 
     # Generic extensibility
     other_args: list[tuple[str,str]] = dataclasses.field(default_factory=list, metadata={'desc': 'Additional output arguments'})
     other_flags: list[str] = dataclasses.field(default_factory=list, metadata={'desc': 'Additional command flags'})
 
     def __post_init__(self):
+        if self.progress is not None and self.progress_callback is not None:
+            raise ValueError('progress and progress_callback both set ffmpeg\'s -progress target; pass only one.')
         if isinstance(self.inputs, FFInput):
             self.inputs = [self.inputs]
         if isinstance(self.outputs, FFOutput):
@@ -155,34 +189,51 @@ class FFMPEG:
         check_output_exists: bool = False,
     ) -> FFMPEGResult:
         '''Run the FFMPEG command with the provided parameters.'''
-        for output in self.outputs:
-            if output.args.y is not True and Path(output.path).exists():
-                raise FileExistsError(f'Output file already exists: {output.path}. Pass y=True to overwrite.')
+        self._check_outputs_writable()
+        result = FFMPEGResult(
+            command=self, 
+            result=run_ffmpeg_subprocess(self.build_command(), timeout=timeout, cwd=cwd, env=env, progress_callback=self.progress_callback)
+        )
+        if check_output_exists:
+            result.check_outputs_not_empty()
+        return result
 
+    async def arun(
+        self,
+        timeout: float|None = None,
+        cwd: str|Path|None = None,
+        env: str|Path|None = None,
+        check_output_exists: bool = False,
+    ) -> FFMPEGResult:
+        '''Run the FFMPEG command without blocking the event loop. Use ffmpeg_many 
+            to run a batch of commands concurrently.
+        '''
+        self._check_outputs_writable()
         result = FFMPEGResult(
             command=self, 
-            result=run_ffmpeg_subprocess(self.build_command(), timeout=timeout, cwd=cwd, env=env)
+            result=await run_ffmpeg_subprocess_async(self.build_command(), timeout=timeout, cwd=cwd, env=env, progress_callback=self.progress_callback)
         )
-    
         if check_output_exists:
-            for opath in result.output_files:
-                if Path(opath).exists() and Path(opath).stat().st_size == 0: #if file does not exist, the output may not have been a path
-                    raise OutputFileIsEmptyError(f"FFMPEG command completed but output file is empty: {opath}")
-            
+            result.check_outputs_not_empty()
         return result
+
+    def _check_outputs_writable(self):
+        for output in self.outputs:
+            # os.path.exists accepts str or Path directly, skipping a Path construction per output
+            if output.args.y is not True and os.path.exists(output.path):
+                raise FileExistsError(f'Output file already exists: {output.path}. Pass y=True to overwrite.')
     
     def get_command(self) -> str:
         '''Return the FFMPEG command as a string.'''
-        cmd = self.build_command()
-        return ' '.join(shlex.quote(arg) for arg in cmd)
+        return shlex.join(self.build_command())
 
     def build_command(self) -> list[str]:
         '''Build the FFMPEG command as a list of strings using FFInput and FFOutput specifications.'''
-        args = CmdArgs()
+        args = CmdArgs(["ffmpeg"]) # built in place, no copies of the argument list
         for input_spec in self.inputs:
             args.extend(input_spec.to_args())
 
-        args.extend(CmdArgs.from_field_metadatas(self))
+        args.add_field_metadatas(self)
         
         # handle complex filters
         if self.filter_complex is not None:
@@ -197,7 +248,7 @@ class FFMPEG:
         for output_spec in self.outputs:
             args.extend(output_spec.to_args())
 
-        return CmdArgs(["ffmpeg"] + args)
+        return args
 
 def ffmpeg(
     input: FFInput|None = None,
@@ -212,12 +263,15 @@ def ffmpeg(
     hide_banner: bool = True,
     nostats: bool = True,
     progress: str|None = None,
+    progress_callback: typing.Callable[[dict[str,str]], None]|None = None,
 
     # Generic extensibility
     other_args: list[tuple[str,str]]|None = None,
     other_flags: list[str]|None = None
 ) -> FFMPEG:
     '''Create a new ffmpeg command with type safety and structured configuration.
+        Pass several outputs to produce e.g. a rendition ladder or a thumbnail plus a 
+        transcode in one process: the inputs are read and decoded once for all outputs.
     '''
     return FFMPEG(
         inputs=_parse_multi_items("input", single_item=input, multi_items=inputs),
@@ -227,6 +281,7 @@ def ffmpeg(
         hide_banner=hide_banner,
         nostats=nostats,
         progress=progress,
+        progress_callback=progress_callback,
         other_args=other_args if other_args is not None else [],
         other_flags=other_flags if other_flags is not None else []
     )
@@ -251,6 +306,30 @@ def _parse_multi_items(
 
 
 
+HWACCEL_METHODS = typing.Literal['cuda', 'qsv', 'vaapi', 'videotoolbox', 'd3d11va']
+
+# hardware encoder name suffix for each decode method (e.g. h264_nvenc for cuda)
+_HW_ENCODER_SUFFIXES = {'cuda': 'nvenc', 'qsv': 'qsv', 'vaapi': 'vaapi', 'videotoolbox': 'videotoolbox'}
+
+@dataclasses.dataclass(frozen=True)
+class HWAccelConfig:
+    '''Hardware decoding setup for an input, passed as ffinput(..., hw=...).
+        Without output_format, decoded frames are copied back to system memory; set it 
+        to the method's surface format (e.g. 'cuda', 'qsv', 'vaapi') and use encoder() 
+        for the output codec to keep frames on the GPU from decode to encode.
+    '''
+    method: HWACCEL_METHODS
+    device: str|None = None
+    output_format: str|None = None
+
+    def encoder(self, codec: str = 'h264') -> str:
+        '''Name of the matching hardware encoder, e.g. 'h264_nvenc' for cuda or 'hevc_qsv' for qsv.'''
+        try:
+            return f'{codec}_{_HW_ENCODER_SUFFIXES[self.method]}'
+        except KeyError:
+            raise ValueError(f'No hardware encoder family for hwaccel method {self.method!r}.')
+
+
 @dataclasses.dataclass
 class FFInputArgs:
     """Dataclass representing FFmpeg input specifications with comprehensive options.
@@ -285,6 +364,8 @@ class FFInputArgs:
         # Hardware Acceleration
         hwaccel: Hardware acceleration method like 'cuda', 'vaapi', 'qsv' (FFmpeg: `-hwaccel`).
         hwaccel_device: Specific hardware device to use (FFmpeg: `-hwaccel_device`).
+        hwaccel_output_format: Format of decoded frames, e.g. 'cuda' to keep them in GPU 
+            memory (FFmpeg: `-hwaccel_output_format`).
         
         # Stream Selection
         map_metadata: Metadata mapping specification (FFmpeg: `-map_metadata`).
@@ -304,6 +385,11 @@ class FFInputArgs:
         accurate_seek: Enable accurate seeking at cost of speed (FFmpeg: `-accurate_seek`).
         seek_timestamp: Seek by timestamp instead of frame number (FFmpeg: `-seek_timestamp`).
         
+        # Latency
+        low_latency: Skip input buffering and stream analysis for live sources (FFmpeg: 
+            `-fflags nobuffer -flags low_delay`, plus `-probesize 32 -analyzeduration 0` 
+            unless those are set).
+        
         # Extensibility
         other_args: Additional input arguments as (name, value) tuples.
         other_flags: Additional input flags as strings.
@@ -349,6 +435,7 @@ class FFInputArgs:
     # Hardware Acceleration (Input)
     hwaccel: str|None = dataclasses.field(default=None, metadata={"arg": "hwaccel", 'desc': 'Hardware acceleration method (cuda, vaapi, etc.)'})
     hwaccel_device: str|None = dataclasses.field(default=None, metadata={"arg": "hwaccel_device", 'desc': 'Hardware acceleration device'})
+    hwaccel_output_format: str|None = dataclasses.field(default=None, metadata={"arg": "hwaccel_output_format", 'desc': 'Format of hardware decoded frames'})
 
     # Stream Selection
     map_metadata: str|None = dataclasses.field(default=None, metadata={"arg": "map_metadata", 'desc': 'Map metadata'})
@@ -368,6 +455,9 @@ class FFInputArgs:
     accurate_seek: bool|None = dataclasses.field(default=None, metadata={"flag": "accurate_seek", 'desc': 'Enable accurate seeking'})
     seek_timestamp: bool|None = dataclasses.field(default=None, metadata={"flag": "seek_timestamp", 'desc': 'Seek by timestamp instead of frame'})
 
+    # Latency
+    low_latency: bool = dataclasses.field(default=False, metadata={'desc': 'Skip input buffering and stream analysis'})
+
     # Generic extensibility
     other_args: list[tuple[str,str]] = dataclasses.field(default_factory=list)  # Additional output arguments
     other_flags: list[str] = dataclasses.field(default_factory=list)  # Additional command flags
@@ -375,6 +465,12 @@ class FFInputArgs:
     def to_args(self) -> CmdArgs:
         '''Convert the FFInput to a string representation for FFMPEG command.'''
         cmd = CmdArgs.from_field_metadatas(self)
+        if self.low_latency:
+            cmd.add_args([('fflags', 'nobuffer'), ('flags', 'low_delay')])
+            if self.probesize is None:
+                cmd.add_arg('probesize', 32)
+            if self.analyzeduration is None:
+                cmd.add_arg('analyzeduration', 0)
         if self.other_args:
             cmd.add_args(self.other_args)
         if self.other_flags:
@@ -416,6 +512,8 @@ def ffinput(
     # Hardware Acceleration (Input)
     hwaccel: str|None = None,
     hwaccel_device: str|None = None,
+    hwaccel_output_format: str|None = None,
+    hw: HWAccelConfig|None = None,
     # Stream Selection
     map_metadata: str|None = None,
     map_chapters: str|None = None,
@@ -430,6 +528,8 @@ def ffinput(
     # Seeking & Timing
     accurate_seek: bool|None = None,
     seek_timestamp: bool|None = None,
+    # Latency
+    low_latency: bool = False,
     # Generic extensibility
     other_args: list[tuple[str,str]]|None = None,
     other_flags: list[str]|None = None,
@@ -469,6 +569,8 @@ def ffinput(
         # Hardware Acceleration
         hwaccel: Hardware acceleration method ('cuda', 'vaapi', 'qsv', 'videotoolbox').
         hwaccel_device: Specific hardware device to use (e.g., '0', '/dev/dri/renderD128').
+        hwaccel_output_format: Format of decoded frames (e.g., 'cuda' to keep them on the GPU).
+        hw: HWAccelConfig setting hwaccel, hwaccel_device and hwaccel_output_format together.
         
         # Stream Selection
         map_metadata: Metadata mapping specification (e.g., '0', '-1').
@@ -488,6 +590,10 @@ def ffinput(
         accurate_seek: Enable accurate seeking at cost of speed.
         seek_timestamp: Seek by timestamp instead of frame number.
         
+        # Latency
+        low_latency: Skip input buffering and stream analysis for live sources (RTMP, 
+            RTSP, UDP); minimal probing unless probesize/analyzeduration are given.
+        
         # Extensibility
         other_args: Additional input arguments as (name, value) tuples.
         other_flags: Additional input flags as strings.
@@ -505,6 +611,9 @@ def ffinput(
         Hardware accelerated input:
             >>> inp = ffinput("video.mp4", hwaccel="cuda")
         
+        Hardware decoding that keeps frames in GPU memory:
+            >>> inp = ffinput("video.mp4", hw=HWAccelConfig("cuda", output_format="cuda"))
+        
         Image sequence with frame rate:
             >>> inp = ffinput("frame_%03d.jpg", r="25", f="image2")
         
@@ -517,6 +626,10 @@ def ffinput(
         Audio-only input with specific codec:
             >>> inp = ffinput("audio.flac", c_a="flac", ar="48000")
     """
+    if hw is not None:
+        if any(v is not None for v in (hwaccel, hwaccel_device, hwaccel_output_format)):
+            raise ValueError('Pass either hw or the individual hwaccel arguments, not both.')
+        hwaccel, hwaccel_device, hwaccel_output_format = hw.method, hw.device, hw.output_format
     return FFInput(
         path=path if not isinstance(path, Path) else str(path),
         args=FFInputArgs(
@@ -539,6 +652,7 @@ def ffinput(
             vol=vol,
             hwaccel=hwaccel,
             hwaccel_device=hwaccel_device,
+            hwaccel_output_format=hwaccel_output_format,
             map_metadata=map_metadata,
             map_chapters=map_chapters,
             probesize=probesize,
@@ -549,6 +663,7 @@ def ffinput(
             stream_loop=stream_loop,
             accurate_seek=accurate_seek,
             seek_timestamp=seek_timestamp,
+            low_latency=low_latency,
             other_args=other_args,
             other_flags=other_flags,
         )
@@ -558,6 +673,9 @@ def ffinput(
 
 
 
+# encoders that accept -tune zerolatency and the x264-style preset names
+_ZEROLATENCY_CODECS = ('libx264', 'libx265')
+
 @dataclasses.dataclass
 class FFOutputArgs:
     """Dataclass representing FFmpeg output specifications with comprehensive encoding options.
@@ -645,6 +763,10 @@ class FFOutputArgs:
         # Threading & Performance
         threads: Number of encoding threads (FFmpeg: `-threads`).
         
+        # Latency
+        low_latency: Disable muxer delay (FFmpeg: `-max_delay 0`) and, for libx264/libx265, 
+            use `-tune zerolatency` and `-preset ultrafast` unless tune/preset are set.
+        
         # Extensibility
         other_args: Additional output arguments as (name, value) tuples.
         other_flags: Additional output flags as strings.
@@ -753,6 +875,9 @@ class FFOutputArgs:
     # Threading & Performance
     threads: int|None = dataclasses.field(default=None, metadata={"arg": "threads", "desc": "Number of threads"})
 
+    # Latency
+    low_latency: bool = dataclasses.field(default=False, metadata={"desc": "Zero-latency encoding and muxing"})
+
     # Generic extensibility
     other_args: list[tuple[str,str]] = dataclasses.field(default_factory=list, metadata={"desc": "Additional output arguments"})
     other_flags: list[str] = dataclasses.field(default_factory=list, metadata={"desc": "Additional command flags"})
@@ -761,6 +886,14 @@ class FFOutputArgs:
         '''Convert the FFOutput to arguments for FFMPEG command.'''
         args = CmdArgs.from_field_metadatas(self)
 
+        if self.low_latency:
+            if self.c_v in _ZEROLATENCY_CODECS:
+                if self.tune is None:
+                    args.add_arg('tune', 'zerolatency')
+                if self.preset is None:
+                    args.add_arg('preset', 'ultrafast')
+            args.add_arg('max_delay', 0)
+
         # Always pass -y or -n to prevent interactive prompts
         if self.y:
             args.add_flag('y')
@@ -867,6 +1000,8 @@ def ffoutput(
     c_s: str|None = None,
     # Threading & Performance
     threads: int|None = None,
+    # Latency
+    low_latency: bool = False,
     # Generic extensibility
     other_args: list[tuple[str,str]]|None = None,
     other_flags: list[str]|None = None,
@@ -959,6 +1094,10 @@ def ffoutput(
         # Performance
         threads: Number of encoding threads (0 for auto, or specific number).
         
+        # Latency
+        low_latency: Zero muxer delay; with libx264/libx265 also zerolatency tuning and 
+            the ultrafast preset unless tune/preset are given.
+        
         # Extensibility
         other_args: Additional output arguments as (name, value) tuples.
         other_flags: Additional output flags as strings.
@@ -1054,6 +1193,7 @@ def ffoutput(
             metadata=metadata,
             c_s=c_s,
             threads=threads,
+            low_latency=low_latency,
             other_args=other_args,
             other_flags=other_flags,
         )
@@ -1104,32 +1244,87 @@ class FFMPEGResult:
     def returncode(self) -> int:
         '''Return the return code of the FFMPEG command.'''
         return self.result.returncode
+
+    def check_outputs_not_empty(self):
+        '''Raise OutputFileIsEmptyError if any output file exists but is empty.'''
+        for opath in self.output_files:
+            if opath.exists() and opath.stat().st_size == 0: #if file does not exist, the output may not have been a path
+                raise OutputFileIsEmptyError(f"FFMPEG command completed but output file is empty: {opath}")
     
     def __repr__(self) -> str:
         '''Return a string representation of the FFMPEGResult.'''
-        return f"{self.__class__.__name__}(command={self.command.get_command()}, returncode={self.returncode}, output_length={len(self.result.stderr)})"
+        # result.args is the command list that was executed, so the command is not rebuilt
+        return f"{self.__class__.__name__}(command={shlex.join(self.result.args)}, returncode={self.returncode}, output_length={len(self.result.stderr)})"
 
 
+STDERR_TAIL_LINES = 2048
+
 def run_ffmpeg_subprocess(
     cmd: list[str], 
     timeout: float|None = None, 
     cwd: str|Path|None = None, 
-    env: str|Path|None = None
+    env: str|Path|None = None,
+    progress_callback: typing.Callable[[dict[str,str]], None]|None = None,
 ) -> subprocess.CompletedProcess:
-    '''Run a subprocess with the given command and parameters.'''
+    '''Run a subprocess with the given command and parameters. stdout is captured in 
+        full (ffprobe writes its json there); only the last STDERR_TAIL_LINES lines of 
+        stderr are kept, so long encodes cannot accumulate unbounded progress output.
+        With progress_callback, ffmpeg's -progress reports are parsed and passed to it 
+        on a background thread; an exception it raises is re-raised here after ffmpeg exits.
+    '''
+    pass_fds: tuple[int, ...] = ()
+    progress_reader = None
+    if progress_callback is not None:
+        cmd, progress_fd, progress_reader = _with_progress_pipe(cmd, progress_callback)
+        pass_fds = (progress_fd,)
     try:
         # Execute the command
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            cwd=cwd,
-            env=env,
-            check=True,
-            #stdin=subprocess.DEVNULL, # not sure if I should hard-code this, but here we are.
-        )
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                errors='replace',
+                cwd=cwd,
+                env=env,
+                pass_fds=pass_fds,
+                #stdin=subprocess.DEVNULL, # not sure if I should hard-code this, but here we are.
+            )
+        finally:
+            for fd in pass_fds: # the child has its own copy; closing ours lets the reader see EOF
+                os.close(fd)
+        with proc:
+            stdout_parts: list[str] = []
+            stderr_tail: collections.deque[str] = collections.deque(maxlen=STDERR_TAIL_LINES)
+            readers = [
+                threading.Thread(target=lambda: stdout_parts.append(proc.stdout.read()), daemon=True),
+                threading.Thread(target=lambda: stderr_tail.extend(proc.stderr), daemon=True),
+            ]
+            for t in readers:
+                t.start()
+            if pass_fds:
+                readers.append(progress_reader) # joined so the final report is delivered before returning
+            try:
+                returncode = proc.wait(timeout=timeout)
+            except BaseException: # timeout, KeyboardInterrupt, ...: the readers only finish once ffmpeg exits
+                proc.kill()
+                raise
+            finally:
+                for t in readers:
+                    t.join()
+        result = subprocess.CompletedProcess(cmd, returncode, ''.join(stdout_parts), ''.join(stderr_tail))
+        
+    except subprocess.TimeoutExpired as e:
+        raise FFMPEGCommandTimeoutError(f"FFMPEG command timed out after {timeout} seconds: {' '.join(cmd)}")
         
+    except FileNotFoundError as e:
+        raise FFMPEGNotFoundError("FFMPEG not found in PATH. Please ensure FFMPEG is installed and available.")
+
+    if progress_reader is not None:
+        progress_reader.raise_error()
+    try:
+        result.check_returncode()
     except subprocess.CalledProcessError as e:
         error_msg = f"FFMPEG command failed: {' '.join(cmd)}"
         raise FFMPEGExecutionError.from_stdout_stderr(
@@ -1137,15 +1332,163 @@ def run_ffmpeg_subprocess(
             stderr=e.stderr,
             msg=f'{error_msg} - {e.stderr.strip() if e.stderr else "<no stderr output>"}'
         ) from e
-        
-    except subprocess.TimeoutExpired as e:
-        raise FFMPEGCommandTimeoutError(f"FFMPEG command timed out after {timeout} seconds: {' '.join(cmd)}")
-        
+    return result
+
+
+async def run_ffmpeg_subprocess_async(
+    cmd: list[str], 
+    timeout: float|None = None, 
+    cwd: str|Path|None = None, 
+    env: str|Path|None = None,
+    progress_callback: typing.Callable[[dict[str,str]], None]|None = None,
+) -> subprocess.CompletedProcess:
+    '''Async version of run_ffmpeg_subprocess. The process is killed on timeout or cancellation.'''
+    pass_fds: tuple[int, ...] = ()
+    progress_reader = None
+    if progress_callback is not None:
+        cmd, progress_fd, progress_reader = _with_progress_pipe(cmd, progress_callback)
+        pass_fds = (progress_fd,)
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            pass_fds=pass_fds,
+        )
     except FileNotFoundError as e:
         raise FFMPEGNotFoundError("FFMPEG not found in PATH. Please ensure FFMPEG is installed and available.")
+    finally:
+        for fd in pass_fds:
+            os.close(fd)
 
+    try:
+        stdout, stderr = await asyncio.wait_for(asyncio.gather(proc.stdout.read(), _read_tail(proc.stderr)), timeout)
+        await proc.wait()
+        if progress_reader is not None:
+            await asyncio.to_thread(progress_reader.join)
+    except asyncio.TimeoutError:
+        await _kill_process(proc)
+        raise FFMPEGCommandTimeoutError(f"FFMPEG command timed out after {timeout} seconds: {' '.join(cmd)}")
+    except BaseException:
+        await _kill_process(proc)
+        raise
+    if progress_reader is not None:
+        progress_reader.raise_error()
+
+    result = subprocess.CompletedProcess(
+        args=cmd, 
+        returncode=proc.returncode, 
+        stdout=stdout.decode(errors='replace'), 
+        stderr=stderr.decode(errors='replace'),
+    )
+    if result.returncode != 0:
+        error_msg = f"FFMPEG command failed: {' '.join(cmd)}"
+        raise FFMPEGExecutionError.from_stdout_stderr(
+            stdout=result.stdout,
+            stderr=result.stderr,
+            msg=f'{error_msg} - {result.stderr.strip() if result.stderr else "<no stderr output>"}'
+        )
     return result
 
+class _ProgressReader(threading.Thread):
+    '''Daemon thread that parses -progress report blocks (key=value lines ending with 
+        progress=continue|end) from read_fd and passes each to callback. If the callback 
+        raises, the exception is kept for raise_error and the pipe is drained to EOF, so 
+        ffmpeg never writes into a closed pipe.
+    '''
+    def __init__(self, read_fd: int, callback: typing.Callable[[dict[str,str]], None]):
+        super().__init__(daemon=True)
+        self.read_fd = read_fd
+        self.callback = callback
+        self.error: BaseException|None = None
+
+    def run(self):
+        report: dict[str,str] = {}
+        with open(self.read_fd, errors='replace') as f:
+            for line in f:
+                if self.error is not None:
+                    continue # keep draining
+                key, _, value = line.partition('=')
+                report[key.strip()] = value.strip()
+                if key == 'progress':
+                    try:
+                        self.callback(report)
+                    except BaseException as e:
+                        self.error = e
+                    report = {}
+
+    def raise_error(self):
+        '''Re-raise the callback's exception, if any. Call after the thread is joined.'''
+        if self.error is not None:
+            raise self.error
+
+def _with_progress_pipe(
+    cmd: list[str], 
+    callback: typing.Callable[[dict[str,str]], None],
+) -> tuple[list[str], int, _ProgressReader]:
+    '''Add -progress pipe:<fd> to the command and start a _ProgressReader on the other 
+        end. Returns the new command, the write fd for the child, and the reader.
+    '''
+    read_fd, write_fd = os.pipe()
+    reader = _ProgressReader(read_fd, callback)
+    reader.start()
+    return [cmd[0], '-progress', f'pipe:{write_fd}', *cmd[1:]], write_fd, reader
+
+_TAIL_READ_SIZE = 1 << 16
+
+async def _read_tail(stream: asyncio.StreamReader) -> bytes:
+    '''Read the stream to the end, keeping only the last STDERR_TAIL_LINES lines. Reads 
+        fixed-size chunks and splits on both CR and LF: ffmpeg's stats line ends in CR 
+        only, so line-based reads would overrun the StreamReader limit.
+    '''
+    tail: collections.deque[bytes] = collections.deque(maxlen=STDERR_TAIL_LINES)
+    pending = b''
+    while chunk := await stream.read(_TAIL_READ_SIZE):
+        lines = (pending + chunk).splitlines(keepends=True)
+        pending = b'' if lines[-1].endswith((b'\r', b'\n')) else lines.pop()
+        tail.extend(lines)
+        pending = pending[-_TAIL_READ_SIZE:] # an unterminated line cannot grow without bound
+    if pending:
+        tail.append(pending)
+    return b''.join(tail)
+
+async def _kill_process(proc: asyncio.subprocess.Process):
+    if proc.returncode is None:
+        proc.kill()
+        await proc.wait()
+
+async def arun_many(
+    jobs: typing.Iterable[FFMPEG], 
+    max_concurrency: int|None = None, 
+    **run_kwargs,
+) -> list[FFMPEGResult]:
+    '''Run FFMPEG commands concurrently, at most max_concurrency (default: cpu count) at a time.
+        Results are returned in job order. Extra keyword arguments are passed to FFMPEG.arun.
+        If a job fails, the remaining jobs are cancelled (killing their processes) and the 
+        first error is raised.
+    '''
+    sem = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+    async def run_one(job: FFMPEG) -> FFMPEGResult:
+        async with sem:
+            return await job.arun(**run_kwargs)
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tasks = [tg.create_task(run_one(job)) for job in jobs]
+    except ExceptionGroup as eg:
+        raise eg.exceptions[0] from eg
+    return [task.result() for task in tasks]
+
+def ffmpeg_many(
+    jobs: typing.Iterable[FFMPEG], 
+    max_concurrency: int|None = None, 
+    **run_kwargs,
+) -> list[FFMPEGResult]:
+    '''Run a batch of FFMPEG commands concurrently from synchronous code. 
+        Inside a running event loop (e.g. jupyter), await arun_many instead.
+    '''
+    return asyncio.run(arun_many(jobs, max_concurrency=max_concurrency, **run_kwargs))
 
 
 class CmdArgs(list[str]):
@@ -1207,10 +1550,31 @@ class CmdArgs(list[str]):
     def from_field_metadatas(cls, instance: typing.Type) -> typing.Self:
         '''Create CmdArgs from a dataclass with field metadata.'''
         cmd_args = cls()
-        for f in dataclasses.fields(instance):
-            if 'arg' in f.metadata and (value := getattr(instance, f.name)) is not None:
-                cmd_args.add_arg(f.metadata['arg'], value)
-            elif 'flag' in f.metadata and (value := getattr(instance, f.name)):
-                cmd_args.add_flag(f.metadata['flag'], value)
-
+        cmd_args.add_field_metadatas(instance)
         return cmd_args
+
+    def add_field_metadatas(self, instance: typing.Any):
+        '''Append the arguments and flags described by a dataclass's field metadata.'''
+        append = self.append
+        for attr, arg, flag in _field_metadata_spec(type(instance)):
+            value = getattr(instance, attr)
+            if arg is not None:
+                if value is not None:
+                    append(arg)
+                    append(str(value))
+            elif value:
+                append(flag)
+
+
+@functools.cache
+def _field_metadata_spec(dataclass_type: type) -> tuple[tuple[str, str|None, str|None], ...]:
+    '''(attribute, dashed arg name, dashed flag name) for each field with arg/flag metadata.
+        Computed once per class rather than walking dataclasses.fields on every command.
+    '''
+    spec = []
+    for f in dataclasses.fields(dataclass_type):
+        if 'arg' in f.metadata:
+            spec.append((f.name, CmdArgs.add_dash(f.metadata['arg']), None))
+        elif 'flag' in f.metadata:
+            spec.append((f.name, None, CmdArgs.add_dash(f.metadata['flag'])))
+    return tuple(spec)
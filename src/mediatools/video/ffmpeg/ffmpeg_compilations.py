@@ -148,7 +148,8 @@ def get_random_clips(
                 path = str(video_path),
             ))
         
-        all_clip_infos.extend(list(sorted(vid_clip_infos, key=lambda x: x.start_time)))
+        vid_clip_infos.sort(key=lambda x: x.start_time)
+        all_clip_infos.extend(vid_clip_infos)
 
     return all_clip_infos
 
@@ -299,7 +300,8 @@ def extract_clips(
             else:
                 raise RuntimeError(f"Clip extraction from {fp} failed.")
                     
-    return list(sorted(clip_filenames, key=lambda x: str(x[1])))
+    clip_filenames.sort(key=lambda x: str(x[1]))
+    return clip_filenames
 
 
 def extract_clip_wrap(args) -> str|None:
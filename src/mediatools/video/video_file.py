@@ -43,7 +43,7 @@ class VideoFile(FileBase):
         check_exists: bool = True,
         meta: dict[str, dict|str|int|float|bool|list|None] = None,
     ) -> typing.Self:
-        fp = Path(path)
+        fp = path if isinstance(path, Path) else Path(path) # avoid re-parsing existing Paths
         if check_exists and (not fp.exists() or not fp.is_file()):
             raise VideoFileDoesNotExistError(f'This video file does not exist: {fp}')
         return cls(fp, meta=meta or {})    
@@ -30,9 +30,10 @@ class VideoFiles(list[VideoFile]):
             filter_invalid: include only video files that could be successfully probed.
         '''
         paths = multi_extension_glob(
-            glob_func=Path(root).rglob, # type: ignore
+            path=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=True,
         )
         return cls([VideoFile(fp) for fp in paths])
 
@@ -49,9 +50,10 @@ class VideoFiles(list[VideoFile]):
             filter_invalid: include only video files that could be successfully probed.
         '''
         paths = multi_extension_glob(
-            glob_func=Path(root).glob, # type: ignore
+            path=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=False,
         )
         return cls([VideoFile(fp) for fp in paths])
     
@@ -75,9 +77,10 @@ class VideoFilesDict(dict[Path, VideoFile]):
             filter_invalid: include only video files that could be successfully probed.
         '''
         paths = multi_extension_glob(
-            glob_func=Path(root).rglob, # type: ignore
+            path=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=True,
         )
         return cls({fp: VideoFile(fp) for fp in paths})
 
@@ -94,9 +97,10 @@ class VideoFilesDict(dict[Path, VideoFile]):
             filter_invalid: include only video files that could be successfully probed.
         '''
         paths = multi_extension_glob(
-            glob_func=Path(root).glob, # type: ignore
+            path=root,
             extensions=extensions, 
             base_name_pattern=base_name_pattern,
+            recursive=False,
         )
         return cls({fp: VideoFile(fp) for fp in paths})
 
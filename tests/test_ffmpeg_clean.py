@@ -10,7 +10,7 @@ sys.path.append('../src')
 
 import mediatools
 from mediatools import VideoFiles
-from mediatools.ffmpeg import probe, FFMPEG, ffinput, ffoutput
+from mediatools.ffmpeg import probe, FFMPEG, ffinput, ffoutput, ffmpeg_many
 
 @pytest.fixture(scope="module")
 def test_video():
@@ -343,4 +343,37 @@ def test_ffmpeg_overwrite_protection(test_video, temp_output_dir):
     cmd2.run()
     
     # File should still exist (possibly different size due to different CRF)
-    assert output_path.exists()
\ No newline at end of file
+    assert output_path.exists()
+
+
+@requires_ffmpeg
+def test_ffmpeg_many_concurrent(test_video, temp_output_dir):
+    """Test running a batch of FFMPEG commands concurrently"""
+    jobs = [
+        FFMPEG(
+            inputs=[ffinput(test_video, ss="0", t="1")],
+            outputs=[ffoutput(temp_output_dir / f"clip_{i}.mp4", c_v="libx264", y=True)]
+        )
+        for i in range(3)
+    ]
+    results = ffmpeg_many(jobs, max_concurrency=2)
+
+    assert [r.output_file for r in results] == [temp_output_dir / f"clip_{i}.mp4" for i in range(3)]
+    assert all(r.returncode == 0 for r in results)
+    assert all(r.output_file.stat().st_size > 0 for r in results)
+
+
+@requires_ffmpeg
+def test_ffmpeg_progress_callback(test_video, temp_output_dir):
+    """Test that progress reports are parsed and delivered to the callback"""
+    reports = []
+    cmd = FFMPEG(
+        inputs=[ffinput(test_video, t="2")],
+        outputs=[ffoutput(temp_output_dir / "progress.mp4", c_v="libx264", y=True)],
+        progress_callback=reports.append,
+    )
+    cmd.run()
+
+    assert reports
+    assert reports[-1]["progress"] == "end"
+    assert "out_time" in reports[-1]
@@ -240,6 +240,125 @@ class TestCommandConstruction:
         assert isinstance(command_str, str)
         assert "ffmpeg" in command_str
 
+    def test_multiple_outputs_share_one_input(self, output_dir):
+        cmd = ffmpeg(
+            input=ffinput("input.mp4"),
+            outputs=[ffoutput(output_dir / f"out_{h}.mp4", v_f=f"scale=-2:{h}", y=True) for h in (360, 720)],
+        )
+        args = cmd.build_command()
+        assert args.count("-i") == 1
+        assert args[-1] == str(output_dir / "out_720.mp4")
+        assert args.index("scale=-2:360") < args.index(str(output_dir / "out_360.mp4")) < args.index("scale=-2:720")
+
+    def test_low_latency_args(self):
+        cmd = ffmpeg(
+            input=ffinput("rtmp://host/live", low_latency=True, probesize=500),
+            output=ffoutput("udp://host:1234", f="mpegts", c_v="libx264", preset="fast", low_latency=True, y=True),
+        )
+        args = cmd.build_command()
+        before_input = args[:args.index("-i")]
+        assert ["-fflags", "nobuffer"] == before_input[before_input.index("-fflags"):][:2]
+        assert "32" not in before_input and "500" in before_input
+        assert args[args.index("-tune") + 1] == "zerolatency"
+        assert args[args.index("-preset") + 1] == "fast"
+        assert args.count("-preset") == 1
+
+    def test_hwaccel_config_per_input(self):
+        hw = mediatools.ffmpeg.HWAccelConfig("cuda", device="0", output_format="cuda")
+        cmd = ffmpeg(
+            inputs=[ffinput("a.mp4", hw=hw), ffinput("b.mp4", hw=hw)],
+            output=ffoutput("out.mp4", c_v=hw.encoder(), y=True),
+        )
+        args = cmd.build_command()
+        assert args.count("-hwaccel_output_format") == 2
+        assert args.index("-hwaccel_output_format") < args.index("-i")
+        assert args[args.index("-c:v") + 1] == "h264_nvenc"
+        with pytest.raises(ValueError):
+            ffinput("a.mp4", hw=hw, hwaccel="vaapi")
+
+    def test_async_runner_keeps_tail_of_cr_only_output(self):
+        import asyncio, sys
+        from mediatools.video.ffmpeg.core.command import run_ffmpeg_subprocess_async, STDERR_TAIL_LINES
+        producer = "import sys\nfor i in range(5000): sys.stderr.write('frame=%d fps=30 ' % i + 'x' * 40 + '\\r')"
+        result = asyncio.run(run_ffmpeg_subprocess_async([sys.executable, "-c", producer]))
+        lines = result.stderr.split("\r")
+        assert lines[-2].startswith("frame=4999 ")
+        assert len(lines) - 1 == STDERR_TAIL_LINES
+
+    def test_runner_kills_child_when_interrupted(self, monkeypatch):
+        import subprocess, sys, time
+        from mediatools.video.ffmpeg.core.command import run_ffmpeg_subprocess
+        procs = []
+        wait = subprocess.Popen.wait
+        def interrupted_wait(self, timeout=None):
+            if not procs:
+                procs.append(self)
+                raise KeyboardInterrupt
+            return wait(self, timeout)
+        monkeypatch.setattr(subprocess.Popen, "wait", interrupted_wait)
+
+        start = time.monotonic()
+        with pytest.raises(KeyboardInterrupt):
+            run_ffmpeg_subprocess([sys.executable, "-c", "import time; time.sleep(30)"])
+        assert time.monotonic() - start < 10
+        assert procs[0].returncode is not None
+
+    def test_progress_and_progress_callback_are_exclusive(self):
+        with pytest.raises(ValueError):
+            ffmpeg(input=ffinput("a.mp4"), output=ffoutput("b.mp4", y=True), progress="p.txt", progress_callback=print)
+
+    @pytest.mark.skipif(os.name != "posix", reason="progress pipes need pass_fds")
+    def test_progress_callback_error_reraised_after_exit(self, output_dir):
+        import asyncio, sys
+        from mediatools.video.ffmpeg.core.command import run_ffmpeg_subprocess, run_ffmpeg_subprocess_async
+        # stands in for ffmpeg: writes many more reports than the pipe buffer holds to the -progress fd
+        stub = output_dir / "fake_ffmpeg"
+        done = output_dir / "done"
+        stub.write_text(
+            f"#!{sys.executable}\n"
+            "import os, sys\n"
+            "fd = int(sys.argv[sys.argv.index('-progress') + 1].removeprefix('pipe:'))\n"
+            "with os.fdopen(fd, 'w') as f:\n"
+            "    for i in range(20000): f.write(f'frame={i}\\nprogress=continue\\n')\n"
+            "    f.write('progress=end\\n')\n"
+            f"open({str(done)!r}, 'w').close()\n"
+        )
+        stub.chmod(0o755)
+        def callback(report):
+            raise RuntimeError("callback failed")
+
+        with pytest.raises(RuntimeError, match="callback failed"):
+            run_ffmpeg_subprocess([str(stub)], progress_callback=callback)
+        assert done.exists() # the reader kept draining, so the writer finished normally
+        done.unlink()
+        with pytest.raises(RuntimeError, match="callback failed"):
+            asyncio.run(run_ffmpeg_subprocess_async([str(stub)], progress_callback=callback))
+        assert done.exists()
+
+    def test_arun_many_cancels_siblings_on_failure(self):
+        import asyncio
+        from mediatools.video.ffmpeg.core.command import arun_many
+        cancelled = []
+        class Job: # stands in for FFMPEG; arun_many only calls arun
+            def __init__(self, fail):
+                self.fail = fail
+            async def arun(self):
+                if self.fail:
+                    raise RuntimeError("job failed")
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(self)
+                    raise
+
+        async def main():
+            with pytest.raises(RuntimeError, match="job failed"):
+                await arun_many(jobs, max_concurrency=3)
+            assert sorted(jobs.index(job) for job in cancelled) == [0, 2] # before arun_many returned, not at loop shutdown
+
+        jobs = [Job(False), Job(True), Job(False)]
+        asyncio.run(main())
+
 
 # ===========================================================================
 # Execution tests  (requires dataset + FFmpeg binary)
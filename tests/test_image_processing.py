@@ -101,6 +101,39 @@ class TestImageFile:
         with pytest.raises(FileNotFoundError):
             mediatools.ImageFile.from_path(temp_dir / "nonexistent.png")
 
+    def test_equality_and_hash_use_path(self, tmp_path):
+        a = ImageFile(tmp_path / "a.png", meta={"tag": 1})
+        b = ImageFile(tmp_path / "a.png")
+        assert a == b
+        assert len({a, b, ImageFile(tmp_path / "b.png")}) == 2
+
+    def test_prefetched_stat_is_reused(self, tmp_path):
+        import os
+        path = tmp_path / "missing_later.png"
+        path.write_bytes(b"x" * 10)
+        imf = ImageFile.from_path(path, stat_result=os.stat(path))
+        path.unlink()
+        assert imf.size() == 10
+        assert imf.stat().size == 10
+        assert imf == ImageFile(path)
+
+
+class TestReadImageDims:
+    @pytest.mark.parametrize("ext", ["png", "gif", "bmp", "jpg", "tiff"])
+    def test_matches_pil(self, tmp_path, ext):
+        from PIL import Image as PILImage
+        from mediatools.images.image_meta import read_image_dims
+        path = tmp_path / f"sample.{ext}"
+        PILImage.fromarray(np.zeros((37, 53, 3), dtype=np.uint8)).save(path)
+        assert read_image_dims(path) == (53, 37)
+
+    def test_image_file_probe_size(self, tmp_path):
+        from PIL import Image as PILImage
+        path = tmp_path / "sample.jpg"
+        PILImage.fromarray(np.zeros((37, 53, 3), dtype=np.uint8)).save(path)
+        assert ImageFile.from_path(path).probe_size() == (53, 37)
+
+
 
 # ===========================================================================
 # ImageFiles collection
@@ -128,6 +161,39 @@ class TestImageFiles:
         for imf in image_files:
             assert isinstance(imf, mediatools.ImageFile)
 
+    def test_from_rglob_single_pass_case_insensitive(self, tmp_path):
+        for rel in ('a.jpg', 'sub/b.PNG', 'sub/deeper/c.Tif', 'notes.txt'):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_bytes(b'x')
+        names = [imf.path.name for imf in mediatools.ImageFiles.from_rglob(tmp_path)]
+        assert sorted(names) == ['a.jpg', 'b.PNG', 'c.Tif']
+        assert [imf.path.name for imf in mediatools.ImageFiles.from_glob(tmp_path)] == ['a.jpg']
+
+    def test_multi_extension_glob_single_directory(self, tmp_path):
+        for rel in ('a.MP4', 'b.mov', 'c.txt', 'sub/d.mp4'):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_bytes(b'x')
+        paths = mediatools.multi_extension_glob(tmp_path, ('mp4', '.mov', 'mp4'))
+        assert [p.name for p in paths] == ['a.MP4', 'b.mov']
+        paths = mediatools.multi_extension_glob(tmp_path, ('mp4',), recursive=True)
+        assert [p.name for p in paths] == ['a.MP4', 'd.mp4']
+
+    def test_prefetched_sizes(self, tmp_path):
+        (tmp_path / 'a.png').write_bytes(b'x' * 3)
+        (tmp_path / 'b.jpg').write_bytes(b'x' * 5)
+        files = mediatools.ImageFiles.from_rglob(tmp_path, prefetch_stat=True)
+        assert files.sizes().tolist() == [3, 5]
+        assert files.total_size() == 8
+        assert files.paths().tolist() == [str(tmp_path / 'a.png'), str(tmp_path / 'b.jpg')]
+
+    def test_read_all_parallel_preserves_order(self, tmp_path):
+        from PIL import Image as PILImage
+        for i in range(12):
+            PILImage.fromarray(np.full((4, 4), i, dtype=np.uint8)).save(tmp_path / f"{i:02d}.png")
+        files = mediatools.ImageFiles.from_rglob(tmp_path)
+        values = [int(img.im[0, 0]) for img in files.read_all_parallel(max_workers=3)]
+        assert values == list(range(12))
+
     def test_all_items_are_image_file_instances(self, image_collection):
         for imf in image_collection:
             assert isinstance(imf, mediatools.ImageFile)
@@ -148,6 +214,20 @@ class TestImageRead:
     def test_image_shape_has_at_least_two_dims(self, loaded_image):
         assert len(loaded_image.shape) >= 2
 
+    def test_read_with_float32_dtype(self, image_file):
+        img = image_file.read(dtype=np.float32)
+        assert img.im.dtype == np.float32
+        assert img.im.max() <= 1.0
+
+    def test_pil_backend_matches_skimage(self, tmp_path):
+        from PIL import Image as PILImage
+        arr = (np.random.default_rng(0).random((20, 30, 3)) * 255).astype(np.uint8)
+        for name, pim in (("rgb.png", PILImage.fromarray(arr)), ("pal.png", PILImage.fromarray(arr).convert("P"))):
+            pim.save(tmp_path / name)
+            pil = Image.from_file(tmp_path / name, backend="pil").im
+            ski = Image.from_file(tmp_path / name, backend="skimage").im
+            assert pil.dtype == ski.dtype and np.array_equal(pil, ski)
+
     def test_image_size_property(self, loaded_image):
         h, w = loaded_image.size
         assert h > 0 and w > 0
@@ -168,6 +248,13 @@ class TestImageDtypeConversions:
         ubyte_img = loaded_image.as_ubyte()
         assert ubyte_img.im.dtype == np.uint8
 
+    def test_ubyte_float_roundtrip(self):
+        arr = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        float_img = Image(arr).as_float()
+        assert float_img.im.dtype == np.float32
+        assert float_img.im.max() == pytest.approx(1.0)
+        assert np.array_equal(float_img.as_ubyte().im, arr)
+
     def test_to_rgb_has_three_channels(self, loaded_image):
         rgb = loaded_image.to_rgb()
         assert rgb.shape[2] == 3
@@ -305,6 +392,28 @@ class TestDistanceCalculator:
         dist = loaded_image.dist.sobel(sobel)
         assert isinstance(dist, float)
 
+    def test_euclid_matches_linalg_norm(self):
+        rng = np.random.default_rng(0)
+        a, b = rng.random((20, 30, 3)), rng.random((20, 30, 3))
+        assert Image(a).dist.euclid(Image(b)) == pytest.approx(float(np.linalg.norm(a - b)))
+
+    def test_euclid_uint8_does_not_wrap(self):
+        a = np.zeros((4, 4), dtype=np.uint8)
+        b = np.full((4, 4), 255, dtype=np.uint8)
+        assert Image(a).dist.euclid(Image(b)) == pytest.approx(255.0 * 4)
+
+    def test_sobel_dist_matches_skimage_2d(self):
+        import skimage
+        rng = np.random.default_rng(0)
+        a, b = rng.random((25, 35)), rng.random((25, 35))
+        expected = np.linalg.norm(skimage.filters.sobel(a) - skimage.filters.sobel(b))
+        assert Image(a).dist.sobel(Image(b)) == pytest.approx(float(expected))
+
+    def test_euclid_large_uint8_does_not_overflow(self):
+        a = np.zeros((1500, 1500, 3), dtype=np.uint8)
+        b = np.full((1500, 1500, 3), 255, dtype=np.uint8)
+        assert Image(a).dist.euclid(Image(b)) == pytest.approx(255.0 * np.sqrt(a.size))
+
     def test_composit_equals_euclid_plus_sobel(self, loaded_image):
         other = loaded_image.transform.resize((100, 100))
         # composit = euclid + sobel (on resized pair so sizes match)
@@ -1,4 +1,5 @@
 """Tests for MediaDir functionality, mirroring the examples/0-managing_media_files.ipynb notebook."""
+import json
 import os
 import shutil
 import tempfile
@@ -132,6 +133,238 @@ class TestScanDirectory:
         assert 'totk_builds' in md_no_battles.subdirs
 
 
+class TestScanLocalTree:
+    """Offline scanning tests on a small generated directory tree."""
+
+    @pytest.fixture
+    def local_root(self, tmp_path):
+        for rel in ('a/x.mp4', 'a/b/y.JPG', 'a/b/c/z.txt', 'v.MOV', 'README'):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_bytes(b'x')
+        (tmp_path / 'empty' / 'deeper').mkdir(parents=True)
+        return tmp_path
+
+    def test_classifies_files_case_insensitive(self, local_root):
+        md = scan_directory(local_root)
+        assert {vf.path.name for vf in md.all_video_files()} == {'x.mp4', 'v.MOV'}
+        assert {imf.path.name for imf in md.all_image_files()} == {'y.JPG'}
+        assert {of.path.name for of in md['a/b/c'].other_files} == {'z.txt'}
+
+    def test_parents_set_during_scan(self, local_root):
+        md = scan_directory(local_root)
+        assert md['a/b'].parent is md['a']
+        assert md['a'].parent is md
+
+    def test_flat_file_tree_matches_dict_tree(self, local_root, capsys):
+        from mediatools.util import FileTree, build_file_tree, print_tree
+        ft = FileTree.from_path(local_root)
+        assert ft.to_dict() == build_file_tree(local_root)
+        assert 'empty' not in ft.names
+        assert sorted(ft.names[c] for c in ft.children[0]) == ['README', 'a', 'v.MOV']
+        ft.print_tree()
+        flat_out = capsys.readouterr().out
+        print_tree(ft.to_dict())
+        assert flat_out == capsys.readouterr().out
+
+    def test_from_file_tree_ignore_path(self):
+        from mediatools.constants import VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS
+        tree = {'keep': {'x.mp4': None}, 'skip': {'y.mp4': None}}
+        md = MediaDir.from_file_tree(tree, Path('/r'), VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS,
+            ignore_path=lambda p: p.name == 'skip')
+        assert list(md.subdirs) == ['keep']
+        assert md.all_video_paths() == [Path('/r/keep/x.mp4')]
+
+    def test_dirs_without_files_are_dropped(self, local_root):
+        md = scan_directory(local_root)
+        assert 'empty' not in md.subdirs
+
+    def test_relative_paths(self, local_root):
+        md = scan_directory(local_root, use_absolute=False)
+        assert Path('a/b/y.JPG') in md.all_file_paths()
+
+    def test_cached_aggregations_are_copies(self, local_root):
+        md = scan_directory(local_root)
+        paths = md.all_file_paths()
+        paths.clear()
+        assert len(md.all_file_paths()) == 5
+        assert md.all_dirs()[0] is md
+
+    def test_invalidate_clears_parent_caches(self, local_root):
+        md = scan_directory(local_root)
+        assert len(md.all_video_files()) == 2
+        del md['a']._videos['x.mp4']
+        md['a'].invalidate_cache()
+        assert [vf.path.name for vf in md.all_video_files()] == ['v.MOV']
+
+    def test_subdirs_mutation_invalidates_caches(self, local_root):
+        md = scan_directory(local_root)
+        assert len(md.all_file_paths()) == 5
+        assert len(md['a'].all_dirs()) == 3
+        md.subdirs.pop('a')
+        assert {p.name for p in md.all_file_paths()} == {'v.MOV', 'README'}
+        assert md.all_dirs() == [md]
+
+    def test_nested_subdirs_mutation_invalidates_parent_caches(self, local_root):
+        md = scan_directory(local_root)
+        assert len(md.all_video_files()) == 2
+        del md['a'].subdirs['b']
+        assert [d.path.name for d in md.all_dirs()] == [local_root.name, 'a']
+
+    def test_changed_dirs(self, local_root):
+        before = scan_directory(local_root)
+        (local_root / 'a' / 'b' / 'y.JPG').unlink()
+        after = scan_directory(local_root)
+        assert before.get_changed_dirs(after) == [before['a/b']]
+        assert before.get_changed_dirs(before) == []
+
+    def test_diff_single_pass(self, local_root):
+        before = scan_directory(local_root)
+        (local_root / 'a' / 'x.mp4').unlink()
+        (local_root / 'new' ).mkdir()
+        (local_root / 'new' / 'n.png').write_bytes(b'x')
+        (local_root / 'a' / 'b' / 'added.txt').write_bytes(b'x')
+        result = before.diff(scan_directory(local_root))
+        assert isinstance(result, mediatools.DiffResult)
+        assert result.removed == {local_root / 'a' / 'x.mp4'}
+        assert result.added == {local_root / 'new' / 'n.png', local_root / 'a' / 'b' / 'added.txt'}
+        assert result.changed_dirs == [before['a'], before['a/b']]
+        assert result.unchanged_count == 4
+
+    def test_from_file_tree_classifies_by_name(self):
+        from mediatools.constants import VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS
+        tree = {'a': {'x.MP4': None, 'y.png': None, '.mp4': None, 'noext': None}}
+        md = MediaDir.from_file_tree(tree, Path('/r'), VIDEO_FILE_EXTENSIONS, IMAGE_FILE_EXTENSIONS)
+        assert list(md['a']._videos) == ['x.MP4']
+        assert list(md['a']._images) == ['y.png']
+        assert set(md['a']._other_files) == {'.mp4', 'noext'}
+        assert md['a'].parent is md
+
+    def test_dir_iteration_order(self, local_root):
+        md = scan_directory(local_root, workers=1)
+        assert md.all_dirs()[0] is md
+        assert [d.path.name for d in md.all_dirs()[1:]] == ['a', 'b', 'c']
+        post = list(md.all_dirs_iter())
+        assert post[-1] is md
+        assert post.index(md['a/b/c']) < post.index(md['a/b']) < post.index(md['a'])
+
+    def test_deep_tree_does_not_recurse(self):
+        root = node = MediaDir.empty(Path('r'))
+        for _ in range(1200):
+            child = MediaDir.empty(node.path / 'd', parent=node)
+            node._subdirs['d'] = child
+            node = child
+        assert len(root.all_dirs()) == 1201
+        assert len(list(root.all_dirs_iter())) == 1201
+        assert len(root.all_file_paths()) == 0
+
+    def test_file_diff_returns_paths(self, local_root):
+        before = scan_directory(local_root)
+        (local_root / 'v.MOV').unlink()
+        (local_root / 'a' / 'new.png').write_bytes(b'x')
+        removed, added = before.file_diff(scan_directory(local_root))
+        assert removed == {local_root / 'v.MOV'}
+        assert added == {local_root / 'a' / 'new.png'}
+
+    def test_hash_all_files(self, local_root):
+        import hashlib
+        md = scan_directory(local_root)
+        hashes = md.hash_all_files(workers=2)
+        assert list(hashes) == md.all_file_paths()
+        assert set(hashes.values()) == {hashlib.sha256(b'x').hexdigest()}
+
+    def test_hash_file_buffer_size(self, local_root):
+        from mediatools.util import hash_file
+        fp = local_root / 'v.MOV'
+        fp.write_bytes(b'abc' * 1000)
+        assert hash_file(fp, buffer_size=7) == hash_file(fp)
+        assert hash_file(fp, 'sha3_256', buffer_size=7) == hash_file(fp, 'sha3_256')
+
+    @pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason='needs named pipes')
+    def test_hash_file_short_first_read(self, tmp_path):
+        import hashlib
+        import threading
+        import time
+        from mediatools.util import hash_file
+        fifo = tmp_path / 'pipe'
+        os.mkfifo(fifo)
+        def write():
+            with open(fifo, 'wb', buffering=0) as f:
+                f.write(b'a' * 10)
+                time.sleep(0.2) # the reader's first read returns only the first write
+                f.write(b'b' * 10)
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            assert hash_file(fifo) == hashlib.sha256(b'a' * 10 + b'b' * 10).hexdigest()
+        finally:
+            writer.join()
+
+    def test_hash_files_sorted(self, local_root):
+        import hashlib
+        paths = scan_directory(local_root).all_file_paths()
+        hashes = mediatools.hash_files(reversed(paths), workers=2)
+        assert list(hashes) == sorted(paths)
+        assert set(hashes.values()) == {hashlib.sha256(b'x').hexdigest()}
+
+    def test_hash_files_cached(self, local_root, tmp_path_factory):
+        cache = tmp_path_factory.mktemp('cache') / 'hashes.sqlite'
+        paths = scan_directory(local_root).all_file_paths()
+        first = mediatools.hash_files_cached(paths, cache_path=cache)
+        assert first == mediatools.hash_files(paths, sort_paths=False)
+        assert mediatools.hash_files_cached(paths, cache_path=cache) == first
+
+        readme = local_root / 'README'
+        readme.write_bytes(b'changed')
+        assert mediatools.hash_file_cached(readme, cache_path=cache) == mediatools.hash_file(readme)
+
+    def test_from_dict_is_lazy(self, local_root):
+        data = scan_directory(local_root).to_dict()
+        md = MediaDir.from_dict(data)
+        assert not md._is_loaded('_subdirs')
+        assert md.to_dict() == data
+        assert md['a/b'].parent.parent is md
+        assert not md['a']._is_loaded('_videos')
+        assert {p.name for p in md.all_file_paths()} == {'x.mp4', 'y.JPG', 'z.txt', 'v.MOV', 'README'}
+        assert md.to_dict() == data
+
+    def test_compact_to_dict_roundtrip(self, local_root):
+        md = scan_directory(local_root)
+        full, compact = md.to_dict(), md.to_dict(compact=True)
+        assert 'path' not in compact['subdirs'][0]
+        assert len(json.dumps(compact)) < len(json.dumps(full))
+        restored = MediaDir.from_dict(json.loads(json.dumps(compact)))
+        assert restored.all_file_paths() == md.all_file_paths()
+        assert restored.to_dict() == full
+
+    def test_parallel_scan_matches_serial(self, local_root):
+        for i in range(8):
+            (local_root / f'd{i}' / 'sub').mkdir(parents=True)
+            (local_root / f'd{i}' / 'sub' / f'{i}.png').write_bytes(b'x')
+        serial = scan_directory(local_root, workers=1)
+        parallel = scan_directory(local_root, workers=4)
+        assert sorted(parallel.all_file_paths()) == sorted(serial.all_file_paths())
+        assert parallel['d3/sub'].parent is parallel['d3']
+        assert 'empty' not in parallel.subdirs
+
+    @pytest.mark.parametrize('num_processes', [1, 2])
+    def test_parallel_map_runs_initializer(self, num_processes):
+        from mediatools.util import parallel_map, parallel_starmap
+        assert parallel_map(_read_worker_state, [1, 2], num_processes=num_processes, 
+            initializer=_set_worker_state, initargs=('init',)) == [('init', 1), ('init', 2)]
+        assert parallel_starmap(_read_worker_state, [(3,), (4,)], num_processes=num_processes, 
+            initializer=_set_worker_state, initargs=('star',)) == [('star', 3), ('star', 4)]
+
+
+_WORKER_STATE = None
+
+def _set_worker_state(value):
+    global _WORKER_STATE
+    _WORKER_STATE = value
+
+def _read_worker_state(x):
+    return (_WORKER_STATE, x)
+
+
 # ===========================================================================
 # Directory navigation
 # ===========================================================================